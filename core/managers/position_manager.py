@@ -6,6 +6,8 @@ Funciona sem dependências de position.execution
 """
 
 import logging
+import time
+from types import SimpleNamespace
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 
@@ -29,6 +31,7 @@ class PositionManager(StatefulManager):
         self.paper_trading = paper_trading
         self.balance = 0.0
         self.positions = {}  # Tracking simples de posições
+        self._cfg = None  # Snapshot das configurações usadas a cada tick
         
         super().__init__(config, "PositionManager")
         
@@ -40,8 +43,21 @@ class PositionManager(StatefulManager):
     
     def _initialize(self):
         """Inicialização específica do Position Manager"""
-        # Configurações básicas já carregadas no __init__
-        pass
+        self._load_cfg()
+    
+    def _load_cfg(self) -> SimpleNamespace:
+        """Carrega em uma única passada as configurações consultadas a cada tick"""
+        self._cfg = SimpleNamespace(
+            cooldown=self._get_config('strategy.cooldown_between_trades_seconds', 300),
+            base_amount=self._get_config('trading.base_amount_usdt', 100.0),
+            risk_pct=self._get_config('trading.risk_per_trade_pct', 2.0),
+            max_positions=self._get_config('trading.max_positions', 5)
+        )
+        return self._cfg
+    
+    def _should_reinitialize(self, old_config: Dict, new_config: Dict) -> bool:
+        """Recarrega o snapshot de configuração a cada reload"""
+        return True
     
     def _get_required_config_keys(self) -> list:
         """Chaves de configuração obrigatórias"""
@@ -95,11 +111,11 @@ class PositionManager(StatefulManager):
     
     def _check_cooldown(self) -> bool:
         """Verifica cooldown entre trades"""
-        cooldown = self._get_config('strategy.cooldown_between_trades_seconds', 300)
-        last_trade_time = self._state.get('last_trade_time')
+        cooldown = (self._cfg or self._load_cfg()).cooldown
+        last_trade_epoch = self._state.get('last_trade_epoch')
         
-        if last_trade_time:
-            time_since_trade = (datetime.now() - last_trade_time).total_seconds()
+        if last_trade_epoch:
+            time_since_trade = time.time() - last_trade_epoch
             if time_since_trade < cooldown:
                 return False
         
@@ -147,6 +163,7 @@ class PositionManager(StatefulManager):
             # Atualiza estado
             self.update_state({
                 'last_trade_time': datetime.now(),
+                'last_trade_epoch': time.time(),
                 'total_positions_opened': self._state.get('total_positions_opened', 0) + 1
             })
             
@@ -174,8 +191,9 @@ class PositionManager(StatefulManager):
         """Calcula tamanho da posição"""
         try:
             # Cálculo simples baseado no risco por trade
-            base_amount = self._get_config('trading.base_amount_usdt', 100.0)
-            risk_pct = self._get_config('trading.risk_per_trade_pct', 2.0)
+            cfg = self._cfg or self._load_cfg()
+            base_amount = cfg.base_amount
+            risk_pct = cfg.risk_pct
             
             # Usa uma fração do saldo baseada no risco
             risk_amount = self.balance * (risk_pct / 100.0)
@@ -364,7 +382,7 @@ class PositionManager(StatefulManager):
             health_status['issues'].append("Saldo insuficiente")
         
         # Verifica se tem muitas posições abertas
-        max_positions = self._get_config('trading.max_positions', 5)
+        max_positions = (self._cfg or self._load_cfg()).max_positions
         if len(self.positions) >= max_positions:
             health_status['issues'].append(f"Muitas posições abertas: {len(self.positions)}")
     
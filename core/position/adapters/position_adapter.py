@@ -5,23 +5,117 @@ Position Manager Adapter - Versão Simplificada e Funcional
 Corrige todos os problemas de sintaxe e compatibilidade
 """
 
+import functools
+import inspect
 import logging
+import sys
 from typing import Dict, Any, Optional, Tuple
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=8)
+def _manager_methods(manager_cls) -> frozenset:
+    """Métodos públicos da classe do manager - resolvidos uma vez por tipo"""
+    return frozenset(
+        name for name in dir(manager_cls)
+        if not name.startswith('_') and callable(getattr(manager_cls, name, None))
+    )
+
+def _specialize_call(target, params: Tuple[str, ...], arity: int):
+    """
+    Gera uma chamada dedicada à assinatura resolvida do manager
+    
+    O código gerado repassa exatamente os `arity` primeiros parâmetros ao
+    alvo, sem fatiamento de argumentos nem getattr a cada chamada. Os nomes
+    vêm das tuplas fixas do adaptador, nunca de entrada externa.
+    """
+    source = (
+        f"def call({', '.join(params)}):\n"
+        f"    return target({', '.join(params[:arity])})\n"
+    )
+    namespace = {'target': target}
+    exec(source, namespace)
+    return namespace['call']
+
 class PositionManagerAdapter:
     """Adaptador simplificado e funcional para PositionManager"""
     
+    __slots__ = (
+        'position_manager', '_methods', '_positions_authoritative', 'strategy_cache',
+        '_open_dispatch', '_close_dispatch', '_open_strategies', '_close_strategies',
+        '_proxy_cache', '_resolved_methods',
+    )
+    
+    # Número de argumentos posicionais repassados por cada estratégia
+    _OPEN_ARITY = {'with_confidence': 6, 'with_reason': 5, 'basic': 4}
+    _CLOSE_ARITY = {'with_percentage': 4, 'with_reason': 3, 'with_price': 2, 'symbol_only': 1}
+    
+    # Métodos do manager repassados sem lógica própria e chamados a cada ciclo
+    _HOT_PROXY_METHODS = ('update_position', 'get_all_positions', 'calculate_unrealized_pnl')
+    
+    # Parâmetros recebidos pelo adaptador, na ordem repassada ao manager
+    _OPEN_PARAMS = ('symbol', 'side', 'size', 'price', 'reason', 'confidence')
+    _CLOSE_PARAMS = ('symbol', 'price', 'reason', 'percentage')
+    
     def __init__(self, position_manager):
         self.position_manager = position_manager
+        self._proxy_cache = {}  # nome -> método do manager já resolvido
+        self._methods = _manager_methods(type(position_manager))
+        
+        # Pré-resolve os métodos quentes: o proxy já começa com o cache cheio
+        for name in self._HOT_PROXY_METHODS:
+            if name in self._methods:
+                self._proxy_cache[name] = getattr(position_manager, name)
+        
+        # Consultas negativas respondidas pelo dict `positions` do próprio manager
+        # (lido a cada consulta, nunca copiado: mudanças feitas fora do adaptador valem)
+        self._positions_authoritative = isinstance(getattr(position_manager, 'positions', None), dict)
+        
+        # Cache da estratégia que funcionou para cada método (nome -> estratégia)
+        self.strategy_cache = {}
+        self._resolved_methods = set()  # Métodos com estratégia fixada pela assinatura
+        
+        # Tabelas de despacho: estratégia cacheada = um lookup + uma chamada
+        self._open_dispatch = {
+            name: functools.partial(self._call_manager, 'open_position', arity)
+            for name, arity in self._OPEN_ARITY.items()
+        }
+        self._close_dispatch = {
+            name: functools.partial(self._call_manager, 'close_position', arity)
+            for name, arity in self._CLOSE_ARITY.items()
+        }
+        
+        # Ordem de tentativa imutável, montada uma única vez
+        self._open_strategies = tuple(self._open_dispatch.items())
+        self._close_strategies = tuple(self._close_dispatch.items())
+        
+        # Resolve assinaturas uma única vez, sem chamadas de teste no manager
+        self._resolve_strategy('open_position', self._OPEN_ARITY,
+                               self._open_dispatch, self._OPEN_PARAMS)
+        self._resolve_strategy('close_position', self._CLOSE_ARITY,
+                               self._close_dispatch, self._CLOSE_PARAMS)
+        
         logger.info("PositionManagerAdapter inicializado (versão simplificada)")
     
+    @property
+    def config(self):
+        """Configuração do manager envolvido"""
+        return getattr(self.position_manager, 'config', None)
+    
+    @config.setter
+    def config(self, new_config):
+        """Repassa nova configuração ao manager (o adaptador não guarda estado próprio)"""
+        if 'reload_config' in self._methods:
+            self.position_manager.reload_config(new_config)
+        else:
+            self.position_manager.config = new_config
+    
     def has_position(self, symbol: str) -> bool:
         """Verifica se tem posição para o símbolo"""
         try:
-            if hasattr(self.position_manager, 'has_position'):
+            if self._positions_authoritative and symbol not in self.position_manager.positions:
+                return False
+            if 'has_position' in self._methods:
                 return self.position_manager.has_position(symbol)
             elif hasattr(self.position_manager, 'positions'):
                 return symbol in self.position_manager.positions
@@ -33,7 +127,9 @@ class PositionManagerAdapter:
     def get_position(self, symbol: str):
         """Obtém dados da posição"""
         try:
-            if hasattr(self.position_manager, 'get_position'):
+            if self._positions_authoritative and symbol not in self.position_manager.positions:
+                return None
+            if 'get_position' in self._methods:
                 return self.position_manager.get_position(symbol)
             elif hasattr(self.position_manager, 'positions'):
                 return self.position_manager.positions.get(symbol)
@@ -45,7 +141,7 @@ class PositionManagerAdapter:
     def can_open_position(self, symbol: str) -> bool:
         """Verifica se pode abrir nova posição"""
         try:
-            if hasattr(self.position_manager, 'can_open_position'):
+            if 'can_open_position' in self._methods:
                 return self.position_manager.can_open_position(symbol)
             return not self.has_position(symbol)
         except Exception as e:
@@ -56,7 +152,7 @@ class PositionManagerAdapter:
         """Define saldo atual"""
         try:
             # Tenta múltiplas estratégias
-            if hasattr(self.position_manager, 'set_balance'):
+            if 'set_balance' in self._methods:
                 self.position_manager.set_balance(balance)
             elif hasattr(self.position_manager, 'balance'):
                 self.position_manager.balance = balance
@@ -68,7 +164,7 @@ class PositionManagerAdapter:
     def get_balance(self) -> float:
         """Retorna saldo atual"""
         try:
-            if hasattr(self.position_manager, 'get_balance'):
+            if 'get_balance' in self._methods:
                 return self.position_manager.get_balance()
             elif hasattr(self.position_manager, 'balance'):
                 return getattr(self.position_manager, 'balance', 0.0)
@@ -80,56 +176,114 @@ class PositionManagerAdapter:
     def open_position(self, symbol: str, side: str, size: float, price: float, 
                      reason: str = None, confidence: float = None) -> Dict[str, Any]:
         """Abre posição com múltiplas estratégias"""
-        strategies = [
-            lambda: self.position_manager.open_position(symbol, side, size, price, reason, confidence),
-            lambda: self.position_manager.open_position(symbol, side, size, price, reason),
-            lambda: self.position_manager.open_position(symbol, side, size, price),
-        ]
-        
-        for strategy in strategies:
-            try:
-                result = strategy()
-                if result:
-                    return result if isinstance(result, dict) else {'success': True, 'trade': result}
-            except TypeError:
-                continue
-            except Exception as e:
-                logger.debug(f"Estratégia open_position falhou: {e}")
-                continue
+        result = self._execute_strategies('open_position', self._open_dispatch,
+                                          self._open_strategies, symbol, side, size, price, reason, confidence)
+        if result:
+            if not isinstance(result, dict):
+                result = {'success': True, 'trade': result}
+            return result
         
         return {'success': False, 'error': 'Falha ao abrir posição'}
     
     def close_position(self, symbol: str, price: float = None, reason: str = None, 
                       percentage: float = 1.0) -> Dict[str, Any]:
         """Fecha posição com múltiplas estratégias"""
-        strategies = [
-            lambda: self.position_manager.close_position(symbol, price, reason, percentage),
-            lambda: self.position_manager.close_position(symbol, price, reason),
-            lambda: self.position_manager.close_position(symbol, price),
-            lambda: self.position_manager.close_position(symbol),
-        ]
-        
-        for strategy in strategies:
+        result = self._execute_strategies('close_position', self._close_dispatch,
+                                          self._close_strategies, symbol, price, reason, percentage)
+        if result:
+            # Remove posição do tracking
+            if hasattr(self.position_manager, 'positions') and symbol in self.position_manager.positions:
+                del self.position_manager.positions[symbol]
+            
+            return result if isinstance(result, dict) else {'success': True, 'trade': result, 'pnl': 0}
+        
+        return {'success': False, 'error': 'Falha ao fechar posição'}
+    
+    def _resolve_strategy(self, method: str, arities: Dict[str, int],
+                          dispatch: Dict[str, Any], params: Tuple[str, ...]):
+        """Escolhe a estratégia compatível com a assinatura do método do manager"""
+        try:
+            target = getattr(self.position_manager, method)
+            signature = inspect.signature(target)
+        except (AttributeError, TypeError, ValueError):
+            return  # Sem introspecção (ex.: método em C) - usa tentativa e erro
+        
+        for name, arity in arities.items():
             try:
-                result = strategy()
-                if result:
-                    # Remove posição do tracking
-                    if hasattr(self.position_manager, 'positions') and symbol in self.position_manager.positions:
-                        del self.position_manager.positions[symbol]
-                    
-                    return result if isinstance(result, dict) else {'success': True, 'trade': result, 'pnl': 0}
+                signature.bind(*([None] * arity))
             except TypeError:
                 continue
+            self.strategy_cache[method] = name
+            self._resolved_methods.add(method)
+            dispatch[name] = _specialize_call(target, params, arity)
+            logger.debug("Estratégia %s resolvida por assinatura: %s", method, name)
+            return
+    
+    def _execute_strategies(self, method: str, dispatch: Dict[str, Any],
+                            strategies: Tuple, *args):
+        """
+        Executa a estratégia cacheada ou testa as demais em ordem
+        
+        Só passa para a próxima estratégia em erro de assinatura; erros de
+        execução interrompem as tentativas para não duplicar ordens.
+        """
+        cached = self.strategy_cache.get(method)
+        if method in self._resolved_methods:
+            # Estratégia vem da assinatura: TypeError aqui é erro interno do
+            # manager, nunca aridade errada - não tenta de novo (duplicaria ordens)
+            try:
+                return dispatch[cached](*args)
             except Exception as e:
-                logger.debug(f"Estratégia close_position falhou: {e}")
+                logger.error("Erro em %s: %s: %s", method, type(e).__name__, e)
+                return None
+        
+        if cached is not None:
+            try:
+                result = dispatch[cached](*args)
+                if result:
+                    return result
+            except TypeError as e:
+                if not self._is_signature_error(e):
+                    logger.error("Erro em %s: %s: %s", method, type(e).__name__, e)
+                    return None
+                del self.strategy_cache[method]
+            except Exception as e:
+                logger.error("Erro em %s: %s: %s", method, type(e).__name__, e)
+                return None
+        
+        for name, strategy in strategies:
+            if name == cached:
                 continue
+            try:
+                result = strategy(*args)
+                if result:
+                    self.strategy_cache[method] = name
+                    return result
+            except TypeError as e:
+                if self._is_signature_error(e):
+                    continue
+                logger.error("Erro em %s: %s: %s", method, type(e).__name__, e)
+                return None
+            except Exception as e:
+                logger.error("Erro em %s: %s: %s", method, type(e).__name__, e)
+                return None
         
-        return {'success': False, 'error': 'Falha ao fechar posição'}
+        return None
+    
+    @staticmethod
+    def _is_signature_error(error: TypeError) -> bool:
+        """Distingue TypeError de assinatura incompatível de erro interno do manager"""
+        message = str(error)
+        return 'argument' in message or 'keyword' in message
+    
+    def _call_manager(self, method: str, arity: int, *args):
+        """Repassa ao manager apenas os primeiros `arity` argumentos posicionais"""
+        return getattr(self.position_manager, method)(*args[:arity])
     
     def calculate_position_size(self, symbol: str, price: float, side: str, confidence: float = 1.0) -> float:
         """Calcula tamanho da posição"""
         try:
-            if hasattr(self.position_manager, 'calculate_position_size'):
+            if 'calculate_position_size' in self._methods:
                 return self.position_manager.calculate_position_size(symbol, price, side, confidence)
             
             # Cálculo simples fallback
@@ -145,7 +299,7 @@ class PositionManagerAdapter:
     def should_close_by_timing(self, symbol: str, current_price: float) -> Tuple[bool, str]:
         """Verifica se deve fechar por timing"""
         try:
-            if hasattr(self.position_manager, 'should_close_by_timing'):
+            if 'should_close_by_timing' in self._methods:
                 return self.position_manager.should_close_by_timing(symbol, current_price)
             return False, "Timing check não disponível"
         except Exception as e:
@@ -155,7 +309,7 @@ class PositionManagerAdapter:
     def check_take_profit_conditions(self, symbol: str, current_price: float) -> Tuple[bool, str, float]:
         """Verifica condições de take profit"""
         try:
-            if hasattr(self.position_manager, 'check_take_profit_conditions'):
+            if 'check_take_profit_conditions' in self._methods:
                 return self.position_manager.check_take_profit_conditions(symbol, current_price)
             return False, "Take profit check não disponível", 0.0
         except Exception as e:
@@ -165,7 +319,7 @@ class PositionManagerAdapter:
     def sync_positions(self, positions):
         """Sincroniza posições com a exchange"""
         try:
-            if hasattr(self.position_manager, 'sync_positions'):
+            if 'sync_positions' in self._methods:
                 return self.position_manager.sync_positions(positions)
             logger.info(f"Sync positions: {len(positions)} posições")
         except Exception as e:
@@ -174,7 +328,7 @@ class PositionManagerAdapter:
     def print_positions(self):
         """Imprime posições atuais"""
         try:
-            if hasattr(self.position_manager, 'print_positions'):
+            if 'print_positions' in self._methods:
                 return self.position_manager.print_positions()
             
             balance = self.get_balance()
@@ -187,7 +341,7 @@ class PositionManagerAdapter:
     def cancel_all_orders(self):
         """Cancela todas as ordens abertas"""
         try:
-            if hasattr(self.position_manager, 'cancel_all_orders'):
+            if 'cancel_all_orders' in self._methods:
                 return self.position_manager.cancel_all_orders()
             logger.info("cancel_all_orders: não disponível")
         except Exception as e:
@@ -195,11 +349,27 @@ class PositionManagerAdapter:
     
     def __getattr__(self, name):
         """Proxy para métodos não implementados"""
+        if name in PositionManagerAdapter.__slots__:
+            raise AttributeError(name)  # Slot ainda não inicializado
+        
+        cached = self._proxy_cache.get(name)
+        if cached is not None:
+            return cached
+        
+        # Método conhecido da classe do manager: dispensa o hasattr
+        if name in self._methods:
+            attr = self._proxy_cache[name] = getattr(self.position_manager, name)
+            return attr
+        
         if hasattr(self.position_manager, name):
-            return getattr(self.position_manager, name)
+            attr = getattr(self.position_manager, name)
+            # Só métodos são cacheados: atributos de dados mudam (ex.: balance)
+            if callable(attr):
+                self._proxy_cache[name] = attr
+            return attr
         else:
             def dummy_method(*args, **kwargs):
-                logger.warning(f"Método {name} não encontrado - retornando None")
+                logger.warning("Método %s não encontrado - retornando None", name)
                 return None
             return dummy_method
 
@@ -209,7 +379,7 @@ EnhancedPositionManagerAdapter = PositionManagerAdapter
 # Função de teste rápido
 def test_adapter():
     """Teste rápido do adaptador"""
-    print("🧪 Testando PositionManagerAdapter...")
+    lines = ["🧪 Testando PositionManagerAdapter..."]
     
     # Mock simples para teste
     class MockPositionManager:
@@ -231,8 +401,11 @@ def test_adapter():
     adapter.set_balance(1500.0)
     balance = adapter.get_balance()
     
-    print(f"✅ Teste básico: saldo definido para {balance}")
-    print("✅ PositionManagerAdapter funcionando")
+    lines.append(f"✅ Teste básico: saldo definido para {balance}")
+    lines.append("✅ PositionManagerAdapter funcionando")
+    
+    # Saída única em vez de um write por linha
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     test_adapter()
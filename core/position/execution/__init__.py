@@ -5,52 +5,70 @@ Position Execution Module
 Componentes de execução de ordens e tracking de posições
 """
 
+import importlib
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Importações seguras dos componentes
-OrderExecutor = None
-OrderExecutionResult = None
-PositionTracker = None
-ExitManager = None
-ExitCondition = None
-
-try:
-    from .order_executor import OrderExecutor, OrderExecutionResult
-    logger.debug("OrderExecutor importado")
-except ImportError as e:
-    logger.debug(f"OrderExecutor não disponível: {e}")
-
-try:
-    from .position_tracker import PositionTracker
-    logger.debug("PositionTracker importado")
-except ImportError as e:
-    logger.debug(f"PositionTracker não disponível: {e}")
-
-try:
-    from .exit_manager import ExitManager, ExitCondition
-    logger.debug("ExitManager importado")
-except ImportError as e:
-    logger.debug(f"ExitManager não disponível: {e}")
-
-# Exporta apenas o que está disponível
-available_exports = []
-
-if OrderExecutor:
-    available_exports.extend(['OrderExecutor', 'OrderExecutionResult'])
-if PositionTracker:
-    available_exports.append('PositionTracker')
-if ExitManager:
-    available_exports.extend(['ExitManager', 'ExitCondition'])
-
-__all__ = available_exports
+# Componentes importados sob demanda (PEP 562): cada submódulo só é
+# carregado no primeiro acesso ao nome correspondente
+_LAZY = {
+    'OrderExecutor': '.order_executor',
+    'OrderExecutionResult': '.order_executor',
+    'PositionTracker': '.position_tracker',
+    'ExitManager': '.exit_manager',
+    'ExitCondition': '.exit_manager',
+}
+
+# Submódulo de cada componente reportado em get_available_components()
+_COMPONENT_MODULES = {
+    'order_executor': '.order_executor',
+    'position_tracker': '.position_tracker',
+    'exit_manager': '.exit_manager',
+}
+
+# Resultado da importação de cada submódulo (None = indisponível), tentada uma vez
+_modules = {}
+
+def _load(module_name: str):
+    """Importa o submódulo uma única vez; None se a importação falhar"""
+    if module_name not in _modules:
+        try:
+            _modules[module_name] = importlib.import_module(module_name, __package__)
+            logger.debug("%s importado", module_name[1:])
+        except ImportError as e:
+            _modules[module_name] = None
+            logger.debug("%s não disponível: %s", module_name[1:], e)
+    return _modules[module_name]
+
+def __getattr__(name):
+    """Importa o componente no primeiro acesso (None se indisponível)"""
+    if name == '__all__':
+        # Só exporta o que realmente importa, como `from ... import *` espera
+        exports = [component for component in _LAZY if __getattr__(component) is not None]
+        globals()['__all__'] = exports
+        return exports
+
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Como antes do import lazy: componente ausente vale None
+    attr = getattr(_load(module_name), name, None)
+    globals()[name] = attr  # Próximos acessos não passam por __getattr__
+    return attr
+
+def __dir__():
+    """Inclui os componentes lazy sem precisar importá-los"""
+    return sorted({*globals(), *_LAZY})
 
 def get_available_components():
     """Retorna componentes disponíveis"""
-    return {
-        'order_executor': OrderExecutor is not None,
-        'position_tracker': PositionTracker is not None,
-        'exit_manager': ExitManager is not None,
-        'total_available': len(available_exports)
-    }
\ No newline at end of file
+    components = {
+        component: _load(module_name) is not None
+        for component, module_name in _COMPONENT_MODULES.items()
+    }
+    components['total_available'] = sum(
+        1 for name in _LAZY if __getattr__(name) is not None
+    )
+    return components
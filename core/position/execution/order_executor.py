@@ -6,20 +6,34 @@ Order Executor - Responsável pela execução de ordens
 """
 
 import logging
-from typing import Dict, Any, Optional
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from ..sizing import PositionSizerFactory
 
 logger = logging.getLogger(__name__)
 
+# Identifica este processo: entry_time_ns (relógio monotônico) só é válido
+# para posições abertas aqui, nunca para posições restauradas de outro processo
+CLOCK_OWNER = f"{os.getpid()}:{time.time_ns()}"
+
 class OrderExecutionResult:
     """Resultado da execução de uma ordem"""
     
+    __slots__ = ('success', 'trade_data', 'error', '_ts_ns')
+    
     def __init__(self, success: bool, trade_data: Dict = None, error: str = None):
         self.success = success
         self.trade_data = trade_data or {}
         self.error = error
-        self.timestamp = datetime.now()
+        self._ts_ns = time.time_ns()  # datetime só é construído se lido
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Momento da criação do resultado"""
+        return datetime.fromtimestamp(self._ts_ns / 1e9)
 
 class OrderExecutor:
     """Executa ordens de abertura e fechamento de posições"""
@@ -29,11 +43,27 @@ class OrderExecutor:
         self.api = api
         self.paper_trading = paper_trading
         
+        # Configuração por par indexada por símbolo (primeira ocorrência vence)
+        trading_pairs = config.get('trading', {}).get('trading_pairs', [])
+        self._pair_by_symbol = {pair.get('symbol'): pair for pair in reversed(trading_pairs)}
+        self._default_pair_config = trading_pairs[0] if trading_pairs else {}
+        self._taker_fee = config.get('exchanges', {}).get('bingx', {}).get('fees', {}).get('taker', 0.0004)
+        
+        # (futures_symbol, leverage, side) já confirmados na exchange
+        self._leverage_set = set()
+        
+        # Parâmetros de ordem constantes por (símbolo, lado), montados na inicialização
+        self._order_routes = {}
+        for pair in trading_pairs:
+            if pair.get('symbol'):
+                for side in ('long', 'short'):
+                    self._order_route(pair['symbol'], side)
+        
         # Position sizer
         sizer_type = config.get('position_sizing', {}).get('method', 'traditional')
         self.position_sizer = PositionSizerFactory.create(sizer_type, config)
         
-        logger.info(f"OrderExecutor inicializado - Paper: {paper_trading}, Sizer: {sizer_type}")
+        logger.info("OrderExecutor inicializado - Paper: %s, Sizer: %s", paper_trading, sizer_type)
     
     def execute_entry_order(self, symbol: str, side: str, price: float, 
                            balance: float, signal_confidence: float = 1.0,
@@ -72,9 +102,26 @@ class OrderExecutor:
             return result
             
         except Exception as e:
-            logger.error(f"Erro ao executar entrada: {e}")
+            logger.error("Erro ao executar entrada: %s", e)
             return OrderExecutionResult(False, error=str(e))
     
+    def execute_entry_orders(self, orders: List[Dict[str, Any]],
+                             max_workers: int = 4) -> List[OrderExecutionResult]:
+        """Executa várias entradas; em trading real as ordens são enviadas em paralelo
+        
+        Cada item de `orders` contém os argumentos de execute_entry_order.
+        Os resultados seguem a ordem de entrada e a falha de uma ordem não
+        afeta as demais.
+        """
+        if self.paper_trading or len(orders) <= 1:
+            return [self.execute_entry_order(**order) for order in orders]
+        
+        # API é síncrona (requests): threads sobrepõem a latência de rede
+        workers = min(max_workers, len(orders))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self.execute_entry_order, **order) for order in orders]
+            return [future.result() for future in futures]
+    
     def execute_exit_order(self, symbol: str, position_data: Dict, 
                           exit_price: float, reason: str, 
                           percentage: float = 1.0) -> OrderExecutionResult:
@@ -88,7 +135,7 @@ class OrderExecutor:
             return result
             
         except Exception as e:
-            logger.error(f"Erro ao executar saída: {e}")
+            logger.error("Erro ao executar saída: %s", e)
             return OrderExecutionResult(False, error=str(e))
     
     def _execute_paper_entry(self, symbol: str, side: str, size: float, 
@@ -101,6 +148,7 @@ class OrderExecutor:
         trade_data = {
             'symbol': symbol,
             'side': side,
+            'is_long': side.lower() == 'long',
             'action': 'open',
             'quantity': size,
             'entry_price': price,
@@ -109,13 +157,16 @@ class OrderExecutor:
             'margin_used': margin_used,
             'leverage': leverage,
             'entry_time': datetime.now(),
+            'entry_time_ns': time.monotonic_ns(),
+            'entry_clock_owner': CLOCK_OWNER,
             'exit_time': None,
             'reason': reason,
             'real_trade': False,
             'sizing_details': sizing_result.details
         }
         
-        logger.info(f"[PAPER] Posição aberta: {side.upper()} {size:.4f} {symbol} @ ${price:.4f}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[PAPER] Posição aberta: %s %.4f %s @ $%.4f", side.upper(), size, symbol, price)
         
         return OrderExecutionResult(True, trade_data)
     
@@ -126,23 +177,25 @@ class OrderExecutor:
             return OrderExecutionResult(False, error="API não disponível")
         
         try:
-            futures_symbol = pair_config.get('futures_symbol', symbol.replace('/', '-'))
-            leverage = pair_config.get('leverage', 2)
+            route = self._order_route(symbol, side, pair_config)
+            leverage = route['leverage']
             
-            # Define leverage
-            try:
-                self.api.set_leverage(futures_symbol, leverage, side=side.upper())
-            except Exception as e:
-                logger.warning(f"Erro ao definir leverage: {e}")
+            # Define leverage (uma vez por símbolo/lado/valor)
+            leverage_key = route['leverage_key']
+            if leverage_key not in self._leverage_set:
+                try:
+                    leverage_result = self.api.set_leverage(route['futures_symbol'], leverage,
+                                                            side=route['leverage_side'])
+                    if not (isinstance(leverage_result, dict) and 'warning' in leverage_result):
+                        self._leverage_set.add(leverage_key)
+                except Exception as e:
+                    logger.warning("Erro ao definir leverage: %s", e)
             
             # Executa ordem
-            order_side = "BUY" if side == 'long' else "SELL"
-            position_side = "LONG" if side == 'long' else "SHORT"
-            
             result = self.api.place_order(
-                symbol=futures_symbol,
-                side=order_side,
-                position_side=position_side,
+                symbol=route['futures_symbol'],
+                side=route['open_side'],
+                position_side=route['open_position_side'],
                 quantity=size,
                 order_type="MARKET"
             )
@@ -152,23 +205,26 @@ class OrderExecutor:
             trade_data = {
                 'symbol': symbol,
                 'side': side,
+                'is_long': side.lower() == 'long',
                 'action': 'open',
                 'quantity': size,
                 'entry_price': price,
                 'pnl': 0.0,
                 'leverage': leverage,
                 'entry_time': datetime.now(),
+                'entry_time_ns': time.monotonic_ns(),
+                'entry_clock_owner': CLOCK_OWNER,
                 'reason': reason,
                 'real_trade': True,
                 'order_id': order_id
             }
             
-            logger.info(f"[REAL] Ordem executada: {order_id}")
+            logger.info("[REAL] Ordem executada: %s", order_id)
             
             return OrderExecutionResult(True, trade_data)
             
         except Exception as e:
-            logger.error(f"Erro na execução real: {e}")
+            logger.error("Erro na execução real: %s", e)
             return OrderExecutionResult(False, error=str(e))
     
     def _execute_paper_exit(self, symbol: str, position_data: Dict, 
@@ -178,16 +234,18 @@ class OrderExecutor:
         entry_price = position_data.get('entry_price', 0)
         size = position_data.get('quantity', 0) * percentage
         side = position_data.get('side', 'long')
+        is_long = position_data.get('is_long')
+        if is_long is None:
+            is_long = side.lower() == 'long'
         
         # Calcula PnL
-        if side.lower() == 'long':
+        if is_long:
             pnl = (exit_price - entry_price) * size
         else:
             pnl = (entry_price - exit_price) * size
         
         # Deduz fees
-        fees = self.config.get('exchanges', {}).get('bingx', {}).get('fees', {}).get('taker', 0.0004)
-        fee_cost = size * exit_price * fees
+        fee_cost = size * exit_price * self._taker_fee
         pnl_net = pnl - fee_cost
         
         trade_data = {
@@ -204,8 +262,9 @@ class OrderExecutor:
             'real_trade': False
         }
         
-        action_text = "fechada" if percentage == 1.0 else f"parcialmente fechada ({percentage*100:.0f}%)"
-        logger.info(f"[PAPER] Posição {action_text}: PnL ${pnl_net:.2f}")
+        if logger.isEnabledFor(logging.INFO):
+            action_text = "fechada" if percentage == 1.0 else f"parcialmente fechada ({percentage*100:.0f}%)"
+            logger.info("[PAPER] Posição %s: PnL $%.2f", action_text, pnl_net)
         
         return OrderExecutionResult(True, trade_data)
     
@@ -216,21 +275,16 @@ class OrderExecutor:
             return OrderExecutionResult(False, error="API não disponível")
         
         try:
-            pair_config = self._get_pair_config(symbol)
-            futures_symbol = pair_config.get('futures_symbol', symbol.replace('/', '-'))
-            
             side = position_data.get('side', 'long')
+            route = self._order_route(symbol, side)
             original_size = position_data.get('quantity', 0)
             exit_size = original_size * percentage
             
             # Ordem de fechamento
-            order_side = "SELL" if side == 'long' else "BUY"
-            position_side = side.upper()
-            
             result = self.api.place_order(
-                symbol=futures_symbol,
-                side=order_side,
-                position_side=position_side,
+                symbol=route['futures_symbol'],
+                side=route['close_side'],
+                position_side=route['close_position_side'],
                 quantity=exit_size,
                 order_type="MARKET"
             )
@@ -260,16 +314,34 @@ class OrderExecutor:
             return OrderExecutionResult(True, trade_data)
             
         except Exception as e:
-            logger.error(f"Erro na saída real: {e}")
+            logger.error("Erro na saída real: %s", e)
             return OrderExecutionResult(False, error=str(e))
     
+    def _order_route(self, symbol: str, side: str, pair_config: Dict = None) -> Dict:
+        """Parâmetros de ordem para (símbolo, lado), calculados uma única vez"""
+        key = (symbol, side)
+        route = self._order_routes.get(key)
+        if route is None:
+            if pair_config is None:
+                pair_config = self._get_pair_config(symbol)
+            futures_symbol = pair_config.get('futures_symbol', symbol.replace('/', '-'))
+            leverage = pair_config.get('leverage', 2)
+            route = {
+                'futures_symbol': futures_symbol,
+                'leverage': leverage,
+                'leverage_side': side.upper(),
+                'leverage_key': (futures_symbol, leverage, side.upper()),
+                'open_side': "BUY" if side == 'long' else "SELL",
+                'open_position_side': "LONG" if side == 'long' else "SHORT",
+                'close_side': "SELL" if side == 'long' else "BUY",
+                'close_position_side': side.upper()
+            }
+            self._order_routes[key] = route
+        return route
+    
     def _get_pair_config(self, symbol: str) -> Dict:
         """Obtém configuração específica do par"""
-        trading_pairs = self.config.get('trading', {}).get('trading_pairs', [])
-        for pair in trading_pairs:
-            if pair.get('symbol') == symbol:
-                return pair
-        return trading_pairs[0] if trading_pairs else {}
+        return self._pair_by_symbol.get(symbol, self._default_pair_config)
 
 
 # core/position/execution/position_tracker.py
@@ -279,7 +351,10 @@ class OrderExecutor:
 Position Tracker - Rastreia e gerencia posições ativas
 """
 
+import heapq
+import itertools
 import logging
+from collections import deque
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
@@ -291,37 +366,77 @@ class PositionTracker:
     def __init__(self, config: Dict):
         self.config = config
         self.positions = {}  # symbol -> position_data
-        self.position_history = []
+        self.position_history = deque(maxlen=100)  # Descarta as mais antigas automaticamente
         self.max_concurrent = config.get('strategy', {}).get('max_concurrent_positions', 1)
         
-        logger.info(f"PositionTracker inicializado - Max posições: {self.max_concurrent}")
+        # Contadores por lado, mantidos a cada add/update/remove
+        self._side_counts = {'long': 0, 'short': 0}
+        
+        # Heap (timestamp, seq, symbol) com remoção preguiçosa: entradas cujo
+        # seq não bate com _age_seq[symbol] são descartadas na consulta
+        self._age_heap = []
+        self._age_seq = {}
+        self._age_counter = itertools.count()
+        
+        logger.info("PositionTracker inicializado - Max posições: %s", self.max_concurrent)
     
     def add_position(self, symbol: str, position_data: Dict) -> bool:
         """Adiciona nova posição ao tracking"""
         if len(self.positions) >= self.max_concurrent:
-            logger.warning(f"Limite de posições atingido: {len(self.positions)}/{self.max_concurrent}")
+            logger.warning("Limite de posições atingido: %d/%s", len(self.positions), self.max_concurrent)
             return False
         
         if symbol in self.positions:
-            logger.warning(f"Posição já existe para {symbol}")
+            logger.warning("Posição já existe para %s", symbol)
             return False
         
+        # Normaliza o lado uma única vez
+        side = self._normalize_side(position_data.get('side'))
+        if side is not None:
+            position_data['side'] = side
+        position_data['is_long'] = side is None or side == 'long'  # Sem lado = long
+        
+        # Heap primeiro: só depois a posição é armazenada e contada
+        self._push_age(symbol, position_data)
+        self._count_side(side, 1)
+        
         # Adiciona timestamp de tracking
-        position_data['tracked_since'] = datetime.now()
-        position_data['last_update'] = datetime.now()
+        now = datetime.now()
+        position_data['tracked_since'] = now
+        position_data['last_update'] = now
         
         self.positions[symbol] = position_data
-        logger.info(f"Posição adicionada ao tracking: {symbol}")
+        logger.info("Posição adicionada ao tracking: %s", symbol)
         return True
     
     def update_position(self, symbol: str, updates: Dict) -> bool:
         """Atualiza dados da posição"""
         if symbol not in self.positions:
-            logger.warning(f"Posição não encontrada para update: {symbol}")
+            logger.warning("Posição não encontrada para update: %s", symbol)
             return False
         
-        self.positions[symbol].update(updates)
-        self.positions[symbol]['last_update'] = datetime.now()
+        position = self.positions[symbol]
+        if 'side' in updates:
+            # Normaliza antes de mexer nos contadores: nada muda se falhar
+            side = self._normalize_side(updates['side'])
+            updates = {**updates, 'side': side, 'is_long': side is None or side == 'long'}
+            self._count_side(position.get('side'), -1)
+            self._count_side(side, 1)
+        
+        # Novo entry_time sem carimbo monotônico: descarta o antigo, que ficou defasado
+        if 'entry_time' in updates and 'entry_time_ns' not in updates:
+            position.pop('entry_time_ns', None)
+            position.pop('entry_clock_owner', None)
+        
+        position.update(updates)
+        position['last_update'] = datetime.now()
+        
+        # Preços de saída em cache dependem do lado e da entrada
+        if 'side' in updates or 'entry_price' in updates:
+            position.pop('exit_prices', None)
+        
+        if 'entry_time' in updates:
+            self._push_age(symbol, position)
         return True
     
     def remove_position(self, symbol: str, reason: str = "closed") -> Optional[Dict]:
@@ -330,17 +445,15 @@ class PositionTracker:
             return None
         
         position_data = self.positions.pop(symbol)
+        self._count_side(position_data.get('side', ''), -1)
+        self._age_seq.pop(symbol, None)
         position_data['removed_at'] = datetime.now()
         position_data['removal_reason'] = reason
         
-        # Adiciona ao histórico
+        # Adiciona ao histórico (limitado pelo maxlen do deque)
         self.position_history.append(position_data)
         
-        # Mantém histórico limitado
-        if len(self.position_history) > 100:
-            self.position_history = self.position_history[-100:]
-        
-        logger.info(f"Posição removida do tracking: {symbol} ({reason})")
+        logger.info("Posição removida do tracking: %s (%s)", symbol, reason)
         return position_data
     
     def get_position(self, symbol: str) -> Optional[Dict]:
@@ -365,8 +478,19 @@ class PositionTracker:
     
     def get_positions_by_side(self, side: str) -> List[str]:
         """Retorna símbolos das posições do lado especificado"""
+        side = side.lower()
         return [symbol for symbol, pos in self.positions.items() 
-                if pos.get('side', '').lower() == side.lower()]
+                if pos.get('side', '') == side]
+    
+    @staticmethod
+    def _normalize_side(side):
+        """Lado em minúsculas; valores que não são str ficam como estão"""
+        return side.lower() if isinstance(side, str) else side
+    
+    def _count_side(self, side, delta: int):
+        """Atualiza o contador do lado (já normalizado)"""
+        if isinstance(side, str) and side in self._side_counts:
+            self._side_counts[side] += delta
     
     def calculate_unrealized_pnl(self, symbol: str, current_price: float) -> float:
         """Calcula PnL não realizado da posição"""
@@ -376,18 +500,32 @@ class PositionTracker:
         
         entry_price = position.get('entry_price', 0)
         quantity = position.get('quantity', 0)
-        side = position.get('side', 'long')
         
-        if side.lower() == 'long':
+        if position.get('is_long', True):
             return (current_price - entry_price) * quantity
         else:
             return (entry_price - current_price) * quantity
     
+    def calculate_unrealized_pnl_all(self, current_prices: Dict[str, float]) -> Dict[str, float]:
+        """Calcula PnL não realizado de todas as posições com preço disponível"""
+        pnl = {}
+        for symbol, position in self.positions.items():
+            current_price = current_prices.get(symbol)
+            if current_price is None:
+                continue
+            
+            delta = current_price - position.get('entry_price', 0)
+            if not position.get('is_long', True):
+                delta = -delta
+            pnl[symbol] = delta * position.get('quantity', 0)
+        
+        return pnl
+    
     def get_positions_summary(self) -> Dict:
         """Retorna resumo das posições"""
         total_positions = len(self.positions)
-        long_positions = len(self.get_positions_by_side('long'))
-        short_positions = len(self.get_positions_by_side('short'))
+        long_positions = self._side_counts['long']
+        short_positions = self._side_counts['short']
         
         return {
             'total': total_positions,
@@ -399,15 +537,14 @@ class PositionTracker:
     
     def get_oldest_position(self) -> Optional[tuple]:
         """Retorna a posição mais antiga (símbolo, dados)"""
-        if not self.positions:
-            return None
-        
-        oldest_symbol = min(
-            self.positions.keys(),
-            key=lambda s: self.positions[s].get('entry_time', datetime.now())
-        )
+        heap = self._age_heap
+        while heap:
+            _, seq, symbol = heap[0]
+            if self._age_seq.get(symbol) == seq:
+                return symbol, self.positions[symbol]
+            heapq.heappop(heap)  # Entrada obsoleta
         
-        return oldest_symbol, self.positions[oldest_symbol]
+        return None
     
     def get_positions_older_than(self, minutes: int) -> List[tuple]:
         """Retorna posições mais antigas que X minutos"""
@@ -421,11 +558,38 @@ class PositionTracker:
         
         return old_positions
     
+    @staticmethod
+    def _age_key(entry_time) -> float:
+        """Converte entry_time em epoch (float) comparável entre tipos mistos"""
+        # Sem entry_time (ou em formato desconhecido) a posição é tratada como a mais nova
+        if isinstance(entry_time, datetime):
+            return entry_time.timestamp()
+        if isinstance(entry_time, (int, float)) and not isinstance(entry_time, bool):
+            return float(entry_time)
+        if isinstance(entry_time, str):
+            try:
+                return datetime.fromisoformat(entry_time).timestamp()
+            except ValueError:
+                pass
+        return float('inf')
+    
+    def _push_age(self, symbol: str, position_data: Dict):
+        """Registra a posição no heap de idade"""
+        entry = (self._age_key(position_data.get('entry_time')), next(self._age_counter), symbol)
+        heapq.heappush(self._age_heap, entry)
+        self._age_seq[symbol] = entry[1]
+        
+        # Compacta se as entradas obsoletas dominarem o heap
+        if len(self._age_heap) > 2 * len(self.positions) + 16:
+            self._age_heap = [item for item in self._age_heap
+                              if self._age_seq.get(item[2]) == item[1]]
+            heapq.heapify(self._age_heap)
+    
     def cleanup_history(self, max_entries: int = 50):
         """Limpa histórico de posições"""
-        if len(self.position_history) > max_entries:
-            self.position_history = self.position_history[-max_entries:]
-            logger.info(f"Histórico de posições limitado a {max_entries} entradas")
+        if self.position_history.maxlen != max_entries:
+            self.position_history = deque(self.position_history, maxlen=max_entries)
+            logger.info("Histórico de posições limitado a %s entradas", max_entries)
 
 
 # core/position/execution/exit_manager.py
@@ -436,14 +600,18 @@ Exit Manager - Gerencia condições de saída (TP, SL, timing)
 """
 
 import logging
+import time
 from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
+from .order_executor import CLOCK_OWNER
 
 logger = logging.getLogger(__name__)
 
 class ExitCondition:
     """Representa uma condição de saída"""
     
+    __slots__ = ('type', 'reason', 'priority', 'timestamp')
+    
     def __init__(self, condition_type: str, reason: str, priority: int = 1):
         self.type = condition_type  # 'stop_loss', 'take_profit', 'timing', 'technical'
         self.reason = reason
@@ -463,48 +631,111 @@ class ExitManager:
         self.max_hold_seconds = config.get('strategy', {}).get('max_position_hold_seconds', 7200)
         self.min_hold_seconds = config.get('strategy', {}).get('min_position_hold_seconds', 300)
         
-        logger.info(f"ExitManager inicializado - SL: {self.stop_loss_pct}%, TP: {self.take_profit_pct}%")
+        # Saída parcial e quick profit (resolvidos uma vez; não mudam por tick)
+        strategy_config = config.get('strategy', {})
+        take_profit_config = config.get('risk_management', {}).get('take_profit', {})
+        self.partial_threshold = take_profit_config.get('partial_percentage', 1.5)
+        self.partial_amount = take_profit_config.get('partial_amount_pct', 0.5)
+        self.quick_profit_threshold = strategy_config.get('quick_profit_exit_threshold', 1.0)
+        self.quick_profit_time_limit = strategy_config.get('quick_profit_time_limit_minutes', 10) * 60
+        
+        # Limites de tempo em nanossegundos (comparados com o relógio monotônico)
+        self._max_hold_ns = int(self.max_hold_seconds * 1e9)
+        self._min_hold_ns = int(self.min_hold_seconds * 1e9)
+        self._quick_profit_limit_ns = int(self.quick_profit_time_limit * 1e9)
+        
+        # Tempo abaixo do qual nenhuma saída por tempo é possível
+        self._fast_path_hold_ns = min(self._min_hold_ns, self._max_hold_ns)
+        
+        logger.info("ExitManager inicializado - SL: %s%%, TP: %s%%", self.stop_loss_pct, self.take_profit_pct)
     
     def check_exit_conditions(self, symbol: str, position: Dict, 
                             current_price: float) -> Optional[ExitCondition]:
         """Verifica todas as condições de saída para uma posição"""
         
-        # Stop Loss (prioridade 1)
-        sl_condition = self._check_stop_loss(position, current_price)
-        if sl_condition:
-            return sl_condition
+        # Faixa SL/TP e tempo em posição resolvidos uma vez por tick
+        prices = self._exit_prices(position)
+        pnl_pct = None
+        
+        # Preço dentro da faixa (já com margem): nem SL nem TP podem disparar.
+        # Fora dela a decisão é a comparação exata de pnl_pct com os limiares
+        if prices and not (prices['band_low'] < current_price < prices['band_high']):
+            pnl_pct = self._pnl_pct(prices, current_price)
+            
+            # Stop Loss (prioridade 1)
+            sl_condition = self._check_stop_loss(pnl_pct)
+            if sl_condition:
+                return sl_condition
+            
+            # Take Profit (prioridade 1)
+            tp_condition = self._check_take_profit(pnl_pct)
+            if tp_condition:
+                return tp_condition
         
-        # Take Profit (prioridade 1)
-        tp_condition = self._check_take_profit(position, current_price)
-        if tp_condition:
-            return tp_condition
+        elapsed_ns = self._elapsed_ns(position)
+        if elapsed_ns is None:
+            return None
+        
+        # Antes do tempo mínimo nem timing nem quick profit podem disparar
+        if elapsed_ns < self._fast_path_hold_ns:
+            return None
         
         # Timing - tempo máximo (prioridade 2)
-        timing_condition = self._check_max_timing(position)
+        timing_condition = self._check_max_timing(elapsed_ns)
         if timing_condition:
             return timing_condition
         
         # Quick profit (prioridade 3)
-        quick_condition = self._check_quick_profit(position, current_price)
-        if quick_condition:
-            return quick_condition
+        if prices:
+            if pnl_pct is None:
+                pnl_pct = self._pnl_pct(prices, current_price)
+            return self._check_quick_profit(pnl_pct, elapsed_ns)
         
         return None
     
-    def _check_stop_loss(self, position: Dict, current_price: float) -> Optional[ExitCondition]:
-        """Verifica condição de stop loss"""
+    def _exit_prices(self, position: Dict) -> Optional[Dict]:
+        """Faixa de preços sem saída SL/TP da posição, calculada uma vez por entrada"""
         entry_price = position.get('entry_price', 0)
-        side = position.get('side', 'long')
-        
         if not entry_price:
             return None
         
-        # Calcula PnL percentual
-        if side.lower() == 'long':
-            pnl_pct = ((current_price - entry_price) / entry_price) * 100
-        else:
-            pnl_pct = ((entry_price - current_price) / entry_price) * 100
+        is_long = position.get('is_long')
+        if is_long is None:
+            is_long = position.get('side', 'long').lower() == 'long'
+        thresholds = (self.stop_loss_pct, self.take_profit_pct)
+        
+        # Reaproveita só se entrada, lado e limiares forem os mesmos do cálculo
+        prices = position.get('exit_prices')
+        if (prices is not None and prices['entry_price'] == entry_price
+                and prices['is_long'] == is_long and prices['thresholds'] == thresholds):
+            return prices
+        
+        targets = self.get_exit_targets(entry_price, 'long' if is_long else 'short')
         
+        # Faixa entre SL e TP, independente do lado, estreitada por uma margem
+        # muito maior que o erro de arredondamento entre preço-alvo e pnl_pct:
+        # na fronteira quem decide é a comparação de pnl_pct, como no cálculo original
+        margin = abs(entry_price) * 1e-9
+        prices = {
+            'entry_price': entry_price,
+            'is_long': is_long,
+            'thresholds': thresholds,
+            'band_low': min(targets['stop_loss'], targets['take_profit']) + margin,
+            'band_high': max(targets['stop_loss'], targets['take_profit']) - margin
+        }
+        position['exit_prices'] = prices
+        return prices
+    
+    @staticmethod
+    def _pnl_pct(prices: Dict, current_price: float) -> float:
+        """PnL percentual (mesma fórmula de sempre, para decisões idênticas nos limiares)"""
+        entry_price = prices['entry_price']
+        if prices['is_long']:
+            return ((current_price - entry_price) / entry_price) * 100
+        return ((entry_price - current_price) / entry_price) * 100
+    
+    def _check_stop_loss(self, pnl_pct: float) -> Optional[ExitCondition]:
+        """Verifica condição de stop loss"""
         if pnl_pct <= -self.stop_loss_pct:
             return ExitCondition(
                 'stop_loss',
@@ -514,20 +745,8 @@ class ExitManager:
         
         return None
     
-    def _check_take_profit(self, position: Dict, current_price: float) -> Optional[ExitCondition]:
+    def _check_take_profit(self, pnl_pct: float) -> Optional[ExitCondition]:
         """Verifica condição de take profit"""
-        entry_price = position.get('entry_price', 0)
-        side = position.get('side', 'long')
-        
-        if not entry_price:
-            return None
-        
-        # Calcula PnL percentual
-        if side.lower() == 'long':
-            pnl_pct = ((current_price - entry_price) / entry_price) * 100
-        else:
-            pnl_pct = ((entry_price - current_price) / entry_price) * 100
-        
         if pnl_pct >= self.take_profit_pct:
             return ExitCondition(
                 'take_profit',
@@ -537,16 +756,22 @@ class ExitManager:
         
         return None
     
-    def _check_max_timing(self, position: Dict) -> Optional[ExitCondition]:
-        """Verifica tempo máximo em posição"""
+    def _elapsed_ns(self, position: Dict) -> Optional[int]:
+        """Nanossegundos em posição (relógio monotônico quando disponível)"""
+        entry_time_ns = position.get('entry_time_ns')
+        if entry_time_ns is not None and position.get('entry_clock_owner') == CLOCK_OWNER:
+            return time.monotonic_ns() - entry_time_ns
+        
+        # Sem carimbo deste processo (ex: posição restaurada ou carregada de fora do executor)
         entry_time = position.get('entry_time')
         if not entry_time:
             return None
-        
-        time_in_position = (datetime.now() - entry_time).total_seconds()
-        
-        if time_in_position >= self.max_hold_seconds:
-            minutes = time_in_position / 60
+        return int((datetime.now() - entry_time).total_seconds() * 1e9)
+    
+    def _check_max_timing(self, elapsed_ns: int) -> Optional[ExitCondition]:
+        """Verifica tempo máximo em posição"""
+        if elapsed_ns >= self._max_hold_ns:
+            minutes = elapsed_ns / 60e9
             return ExitCondition(
                 'max_timing',
                 f"Tempo máximo atingido: {minutes:.1f}min",
@@ -555,33 +780,17 @@ class ExitManager:
         
         return None
     
-    def _check_quick_profit(self, position: Dict, current_price: float) -> Optional[ExitCondition]:
+    def _check_quick_profit(self, pnl_pct: float, elapsed_ns: int) -> Optional[ExitCondition]:
         """Verifica saída rápida por lucro"""
-        entry_time = position.get('entry_time')
-        entry_price = position.get('entry_price', 0)
-        side = position.get('side', 'long')
-        
-        if not entry_time or not entry_price:
-            return None
-        
-        time_in_position = (datetime.now() - entry_time).total_seconds()
-        
         # Só considera quick profit após tempo mínimo
-        if time_in_position < self.min_hold_seconds:
+        if elapsed_ns < self._min_hold_ns:
             return None
         
-        # Calcula PnL
-        if side.lower() == 'long':
-            pnl_pct = ((current_price - entry_price) / entry_price) * 100
-        else:
-            pnl_pct = ((entry_price - current_price) / entry_price) * 100
-        
-        # Quick profit threshold configurável
-        quick_profit_threshold = self.config.get('strategy', {}).get('quick_profit_exit_threshold', 1.0)
-        quick_profit_time_limit = self.config.get('strategy', {}).get('quick_profit_time_limit_minutes', 10) * 60
+        if elapsed_ns > self._quick_profit_limit_ns:
+            return None
         
-        if pnl_pct >= quick_profit_threshold and time_in_position <= quick_profit_time_limit:
-            minutes = time_in_position / 60
+        if pnl_pct >= self.quick_profit_threshold:
+            minutes = elapsed_ns / 60e9
             return ExitCondition(
                 'quick_profit',
                 f"Quick profit: +{pnl_pct:.2f}% em {minutes:.1f}min",
@@ -593,30 +802,19 @@ class ExitManager:
     def should_partial_exit(self, symbol: str, position: Dict, 
                           current_price: float) -> Tuple[bool, float, str]:
         """Verifica se deve fazer saída parcial"""
-        entry_price = position.get('entry_price', 0)
-        side = position.get('side', 'long')
-        
-        if not entry_price:
+        prices = self._exit_prices(position)
+        if not prices:
             return False, 0.0, "Sem preço de entrada"
         
-        # Calcula PnL
-        if side.lower() == 'long':
-            pnl_pct = ((current_price - entry_price) / entry_price) * 100
-        else:
-            pnl_pct = ((entry_price - current_price) / entry_price) * 100
-        
-        # Configurações de saída parcial
-        partial_threshold = self.config.get('risk_management', {}).get('take_profit', {}).get('partial_percentage', 1.5)
-        partial_amount = self.config.get('risk_management', {}).get('take_profit', {}).get('partial_amount_pct', 0.5)
-        
         # Verifica se já fez parcial
         if position.get('partial_taken', False):
             return False, 0.0, "Já executou take profit parcial"
         
-        if pnl_pct >= partial_threshold:
-            return True, partial_amount, f"Take profit parcial: +{pnl_pct:.2f}%"
+        pnl_pct = self._pnl_pct(prices, current_price)
+        if pnl_pct >= self.partial_threshold:
+            return True, self.partial_amount, f"Take profit parcial: +{pnl_pct:.2f}%"
         
-        return False, 0.0, f"PnL insuficiente: {pnl_pct:.2f}% < {partial_threshold}%"
+        return False, 0.0, f"PnL insuficiente: {pnl_pct:.2f}% < {self.partial_threshold}%"
     
     def get_exit_targets(self, entry_price: float, side: str) -> Dict[str, float]:
         """Calcula preços-alvo de saída"""
@@ -5,26 +5,69 @@
 Base Position Sizer - Interface para algoritmos de position sizing
 """
 
+import sys
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Dict, Any, Tuple, Optional
 from decimal import Decimal
+from math import floor
+from types import MappingProxyType
 
+_MISSING = object()
+
+# Detalhes compartilhados (somente leitura) quando o chamador dispensa o dict
+NO_DETAILS = MappingProxyType({})
+
+# Nomes de método dos resultados; internados para comparação por identidade
+METHOD_TRADITIONAL = sys.intern('traditional')
+METHOD_VOLATILITY = sys.intern('volatility_adjusted')
+METHOD_KELLY = sys.intern('kelly')
+METHOD_KELLY_FALLBACK = sys.intern('kelly_fallback')
+
+@dataclass
 class PositionSizingResult:
     """Resultado do cálculo de position sizing"""
     
-    def __init__(self, size: float, method: str, details: Dict[str, Any]):
-        self.size = size
-        self.method = method
-        self.details = details
-        self.confidence = details.get('confidence', 1.0)
-        self.risk_amount = details.get('risk_amount', 0.0)
+    __slots__ = ('size', 'method', 'details', 'confidence', 'risk_amount')
+    
+    size: float
+    method: str
+    details: Dict[str, Any]
+    confidence: float
+    risk_amount: float
+    
+    @classmethod
+    def from_details(cls, size: float, method: str,
+                     details: Dict[str, Any]) -> 'PositionSizingResult':
+        """Cria o resultado extraindo confidence/risk_amount dos detalhes"""
+        return cls(size, method, details,
+                   details.get('confidence', 1.0), details.get('risk_amount', 0.0))
 
 class BasePositionSizer(ABC):
     """Interface base para algoritmos de position sizing"""
     
+    # Máximo de entradas nos caches por instância
+    CACHE_SIZE = 256
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.name = self.__class__.__name__
+        self._config_cache = {}  # path -> valor (ou _MISSING)
+    
+    def _get_config(self, path: str, default=None):
+        """Helper para configuração aninhada (caminhos já resolvidos ficam em cache)"""
+        if path in self._config_cache:
+            value = self._config_cache[path]
+        else:
+            value = self.config
+            try:
+                for key in path.split('.'):
+                    value = value[key]
+            except (KeyError, TypeError):
+                value = _MISSING
+            self._config_cache[path] = value
+        
+        return default if value is _MISSING else value
     
     @abstractmethod
     def calculate_size(self, symbol: str, price: float, balance: float, 
@@ -32,15 +75,22 @@ class BasePositionSizer(ABC):
         """Calcula tamanho da posição"""
         pass
     
+    @staticmethod
+    def _clamp(value: float, low: float, high: float) -> float:
+        """Equivalente a max(low, min(high, value)) sem chamar os builtins"""
+        if value > high:
+            value = high
+        return low if value < low else value
+    
     def validate_size(self, size: float, min_size: float, max_size: float, 
                      step_size: float) -> float:
         """Valida e ajusta tamanho da posição"""
-        # Aplica step size
+        # Aplica step size (arredonda ao múltiplo mais próximo)
         if step_size > 0:
-            size = round(size / step_size) * step_size
+            size = floor(size / step_size + 0.5) * step_size
         
         # Aplica limites
-        size = max(min_size, min(size, max_size))
+        size = self._clamp(size, min_size, max_size)
         
         return size
 
@@ -52,30 +102,51 @@ class BasePositionSizer(ABC):
 Traditional Position Sizer - Método tradicional baseado em % do saldo
 """
 
-from .base_sizer import BasePositionSizer, PositionSizingResult
+from typing import Dict, Any
+
+from .base_sizer import BasePositionSizer, PositionSizingResult, NO_DETAILS, METHOD_TRADITIONAL
 
 class TraditionalPositionSizer(BasePositionSizer):
     """Position sizer tradicional baseado em percentual do saldo"""
     
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        # Último (balance, risk_pct, leverage) -> (risk_amount, position_value)
+        self._value_snapshot = None
+    
+    def set_balance(self, balance: float, risk_per_trade_pct: float = 2.0,
+                    leverage: float = 2) -> float:
+        """Pré-calcula o valor de posição para o saldo atual; retorna position_value"""
+        risk_amount = balance * (risk_per_trade_pct / 100)
+        position_value = risk_amount * leverage
+        self._value_snapshot = (balance, risk_per_trade_pct, leverage, risk_amount, position_value)
+        return position_value
+    
     def calculate_size(self, symbol: str, price: float, balance: float, 
-                      signal_confidence: float = 1.0, **kwargs) -> PositionSizingResult:
+                      signal_confidence: float = 1.0, *, risk_per_trade_pct: float = 2.0,
+                      leverage: float = 2, return_details: bool = True,
+                      **kwargs) -> PositionSizingResult:
         """Calcula tamanho usando método tradicional"""
         
-        # Configurações
-        risk_per_trade_pct = kwargs.get('risk_per_trade_pct', 2.0)
-        leverage = kwargs.get('leverage', 2)
-        
-        # Cálculo básico
-        risk_amount = balance * (risk_per_trade_pct / 100)
-        position_value = risk_amount * leverage
+        # Cálculo básico (saldo/risco/leverage mudam raramente entre chamadas)
+        snapshot = self._value_snapshot
+        if (snapshot is None or snapshot[0] != balance or snapshot[1] != risk_per_trade_pct
+                or snapshot[2] != leverage):
+            self.set_balance(balance, risk_per_trade_pct, leverage)
+            snapshot = self._value_snapshot
+        risk_amount, position_value = snapshot[3], snapshot[4]
         base_size = position_value / price
         
         # Ajuste por confiança (opcional)
         confidence_multiplier = 0.5 + (signal_confidence * 0.5)  # 0.5 a 1.0
         adjusted_size = base_size * confidence_multiplier
         
+        if not return_details:
+            return PositionSizingResult(adjusted_size, METHOD_TRADITIONAL, NO_DETAILS,
+                                        signal_confidence, risk_amount)
+        
         details = {
-            'method': 'traditional',
+            'method': METHOD_TRADITIONAL,
             'balance': balance,
             'risk_per_trade_pct': risk_per_trade_pct,
             'risk_amount': risk_amount,
@@ -86,7 +157,22 @@ class TraditionalPositionSizer(BasePositionSizer):
             'confidence': signal_confidence
         }
         
-        return PositionSizingResult(adjusted_size, 'traditional', details)
+        return PositionSizingResult.from_details(adjusted_size, METHOD_TRADITIONAL, details)
+    
+    def calculate_sizes_batch(self, prices, balance: float, confidences=1.0,
+                              risk_per_trade_pct: float = 2.0, leverage: float = 2) -> 'np.ndarray':
+        """Calcula tamanhos para vários símbolos de uma vez (mesmas fórmulas de calculate_size)
+        
+        `prices` e `confidences` podem ser sequências ou arrays; `confidences`
+        também aceita um escalar aplicado a todos os símbolos.
+        """
+        import numpy as np  # Só carregado por quem usa o caminho em lote
+        
+        prices = np.asarray(prices, dtype=np.float64)
+        confidences = np.asarray(confidences, dtype=np.float64)
+        
+        position_value = balance * (risk_per_trade_pct / 100) * leverage
+        return (position_value / prices) * (0.5 + confidences * 0.5)
 
 
 # core/position/sizing/volatility_sizer.py
@@ -97,11 +183,14 @@ Volatility-Adjusted Position Sizer - Baseado no sistema atual
 """
 
 import logging
-from .base_sizer import BasePositionSizer, PositionSizingResult
+import time
+from .base_sizer import BasePositionSizer, PositionSizingResult, NO_DETAILS, METHOD_VOLATILITY
 from .traditional_sizer import TraditionalPositionSizer
 
 logger = logging.getLogger(__name__)
 
+_NO_TRADES = ()  # Default compartilhado para trade_history ausente
+
 class VolatilityPositionSizer(BasePositionSizer):
     """Position sizer ajustado por volatilidade (migrado do arquivo atual)"""
     
@@ -115,55 +204,68 @@ class VolatilityPositionSizer(BasePositionSizer):
         self.min_multiplier = self._get_config('position_sizing.min_size_multiplier', 0.3)
         self.max_multiplier = self._get_config('position_sizing.max_size_multiplier', 2.5)
         
-    def _get_config(self, path: str, default=None):
-        """Helper para configuração"""
-        keys = path.split('.')
-        value = self.config
-        try:
-            for key in keys:
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
-            return default
-    
+        # Cache da análise de volatilidade por (símbolo, janela de tempo)
+        self.vol_cache_ttl = max(1, int(self._get_config('position_sizing.vol_cache_ttl_seconds', 5)))
+        self._vol_cache = {}
+        
     def calculate_size(self, symbol: str, price: float, balance: float, 
-                      signal_confidence: float = 1.0, **kwargs) -> PositionSizingResult:
+                      signal_confidence: float = 1.0, *, trade_history=_NO_TRADES,
+                      return_details: bool = True, **kwargs) -> PositionSizingResult:
         """Calcula tamanho ajustado por volatilidade"""
         
         # Começa com cálculo tradicional
         traditional_result = self.traditional_sizer.calculate_size(
-            symbol, price, balance, signal_confidence, **kwargs
+            symbol, price, balance, signal_confidence, return_details=return_details, **kwargs
         )
         base_size = traditional_result.size
         
-        # Análise de volatilidade
-        volatility_analysis = self._analyze_volatility(symbol)
+        # Análise de volatilidade (reaproveitada dentro da mesma janela)
+        volatility_analysis = self._get_volatility_analysis(symbol)
         
-        # Multiplicadores
-        vol_multiplier = self._calculate_volatility_multiplier(volatility_analysis)
-        kelly_multiplier = self._calculate_kelly_multiplier(kwargs.get('trade_history', []))
-        confidence_multiplier = self._calculate_confidence_multiplier(signal_confidence)
+        # Multiplicadores (volatilidade e confiança inline; mesmas fórmulas
+        # de _calculate_volatility_multiplier/_calculate_confidence_multiplier)
+        clamp = self._clamp
+        current_vol = volatility_analysis.get('current_vol', self.target_vol)
+        vol_multiplier = clamp(self.target_vol / current_vol, 0.3, 2.5) if current_vol > 0 else 1.0
+        kelly_multiplier = self._calculate_kelly_multiplier(trade_history)
+        confidence_multiplier = clamp(0.7 + signal_confidence * 0.6, 0.5, 1.3)
         
         # Multiplicador total
         total_multiplier = vol_multiplier * kelly_multiplier * confidence_multiplier
-        total_multiplier = max(self.min_multiplier, min(self.max_multiplier, total_multiplier))
+        total_multiplier = clamp(total_multiplier, self.min_multiplier, self.max_multiplier)
         
         # Tamanho final
         adjusted_size = base_size * total_multiplier
         
+        if not return_details:
+            return PositionSizingResult(adjusted_size, METHOD_VOLATILITY, NO_DETAILS,
+                                        traditional_result.confidence, traditional_result.risk_amount)
+        
         # Detalhes combinados
-        details = traditional_result.details.copy()
-        details.update({
+        details = {
+            **traditional_result.details,
             'volatility_analysis': volatility_analysis,
             'vol_multiplier': vol_multiplier,
             'kelly_multiplier': kelly_multiplier,
             'confidence_multiplier': confidence_multiplier,
             'total_multiplier': total_multiplier,
             'base_size': base_size,
-            'method': 'volatility_adjusted'
-        })
+            'method': METHOD_VOLATILITY
+        }
         
-        return PositionSizingResult(adjusted_size, 'volatility_adjusted', details)
+        return PositionSizingResult.from_details(adjusted_size, METHOD_VOLATILITY, details)
+    
+    def _get_volatility_analysis(self, symbol: str) -> Dict[str, Any]:
+        """Análise de volatilidade memorizada por janela de vol_cache_ttl segundos"""
+        key = (symbol, int(time.time()) // self.vol_cache_ttl)
+        analysis = self._vol_cache.get(key)
+        if analysis is None:
+            # Janelas antigas não voltam a ser consultadas
+            if len(self._vol_cache) >= self.CACHE_SIZE:
+                self._vol_cache.clear()
+            analysis = self._analyze_volatility(symbol)
+            self._vol_cache[key] = analysis
+        return analysis
     
     def _analyze_volatility(self, symbol: str) -> Dict[str, Any]:
         """Análise básica de volatilidade - pode ser expandida"""
@@ -183,7 +285,7 @@ class VolatilityPositionSizer(BasePositionSizer):
         else:
             vol_multiplier = 1.0
         
-        return max(0.3, min(2.5, vol_multiplier))
+        return self._clamp(vol_multiplier, 0.3, 2.5)
     
     def _calculate_kelly_multiplier(self, trade_history: list) -> float:
         """Kelly criterion básico"""
@@ -196,11 +298,11 @@ class VolatilityPositionSizer(BasePositionSizer):
             return 0.5
         
         win_rate = len(wins) / len(trade_history)
-        return max(0.1, min(2.0, win_rate * 1.5))
+        return self._clamp(win_rate * 1.5, 0.1, 2.0)
     
     def _calculate_confidence_multiplier(self, confidence: float) -> float:
         """Multiplicador baseado na confiança do sinal"""
-        return max(0.5, min(1.3, 0.7 + confidence * 0.6))
+        return self._clamp(0.7 + confidence * 0.6, 0.5, 1.3)
 
 
 # core/position/sizing/kelly_sizer.py
@@ -210,29 +312,36 @@ class VolatilityPositionSizer(BasePositionSizer):
 Kelly Criterion Position Sizer - Implementação pura do Kelly Criterion
 """
 
-import numpy as np
-from .base_sizer import BasePositionSizer, PositionSizingResult
+from typing import Dict, Any, Tuple
+
+from .base_sizer import BasePositionSizer, PositionSizingResult, METHOD_KELLY, METHOD_KELLY_FALLBACK
+
+_NO_TRADES = ()  # Default compartilhado para trade_history ausente
+
+# A partir deste tamanho de histórico as reduções em numpy superam o loop
+_VECTORIZE_MIN_TRADES = 256
 
 class KellyPositionSizer(BasePositionSizer):
     """Position sizer baseado no Kelly Criterion"""
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.min_trades = config.get('kelly.min_trades', 20)
-        self.kelly_fraction = config.get('kelly.fraction', 0.25)  # 25% do Kelly ótimo
+        # Configuração aninhada (kelly: {min_trades, fraction}); chaves planas
+        # 'kelly.min_trades' continuam aceitas como fallback
+        self.min_trades = self._get_config('kelly.min_trades', config.get('kelly.min_trades', 20))
+        self.kelly_fraction = self._get_config('kelly.fraction', config.get('kelly.fraction', 0.25))  # 25% do Kelly ótimo
         
     def calculate_size(self, symbol: str, price: float, balance: float, 
-                      signal_confidence: float = 1.0, **kwargs) -> PositionSizingResult:
+                      signal_confidence: float = 1.0, *, trade_history=_NO_TRADES,
+                      max_position_pct: float = 10.0, **kwargs) -> PositionSizingResult:
         """Calcula tamanho usando Kelly Criterion"""
         
-        trade_history = kwargs.get('trade_history', [])
-        
         if len(trade_history) < self.min_trades:
             # Fallback para método conservador
             conservative_size = balance * 0.01 / price  # 1% do saldo
-            return PositionSizingResult(
+            return PositionSizingResult.from_details(
                 conservative_size, 
-                'kelly_fallback',
+                METHOD_KELLY_FALLBACK,
                 {'reason': 'insufficient_trades', 'trades_count': len(trade_history)}
             )
         
@@ -244,7 +353,6 @@ class KellyPositionSizer(BasePositionSizer):
         position_size = (balance * optimal_fraction) / price
         
         # Limita para segurança
-        max_position_pct = kwargs.get('max_position_pct', 10.0)
         max_size = (balance * max_position_pct / 100) / price
         position_size = min(position_size, max_size)
         
@@ -254,28 +362,39 @@ class KellyPositionSizer(BasePositionSizer):
             'optimal_fraction': optimal_fraction,
             'trades_analyzed': len(trade_history),
             'max_position_limit': max_size,
-            'method': 'kelly'
+            'method': METHOD_KELLY
         }
         
-        return PositionSizingResult(position_size, 'kelly', details)
+        return PositionSizingResult.from_details(position_size, METHOD_KELLY, details)
     
     def _calculate_kelly_fraction(self, trades: list) -> float:
         """Calcula fração do Kelly Criterion"""
         if not trades:
             return 0.01
         
-        # Separa wins/losses
-        wins = [t['pnl'] for t in trades if t.get('pnl', 0) > 0]
-        losses = [abs(t['pnl']) for t in trades if t.get('pnl', 0) < 0]
-        
-        if not wins or not losses:
+        if len(trades) >= _VECTORIZE_MIN_TRADES:
+            wins_sum, wins_count, losses_sum, losses_count = self._win_loss_stats_vectorized(trades)
+        else:
+            # Acumula wins/losses em uma única passada
+            wins_sum = losses_sum = 0.0
+            wins_count = losses_count = 0
+            for trade in trades:
+                pnl = trade.get('pnl', 0)
+                if pnl > 0:
+                    wins_sum += pnl
+                    wins_count += 1
+                elif pnl < 0:
+                    losses_sum -= pnl
+                    losses_count += 1
+        
+        if not wins_count or not losses_count:
             return 0.01
         
         # Parâmetros Kelly
-        win_prob = len(wins) / len(trades)
+        win_prob = wins_count / len(trades)
         loss_prob = 1 - win_prob
-        avg_win = np.mean(wins)
-        avg_loss = np.mean(losses)
+        avg_win = wins_sum / wins_count
+        avg_loss = losses_sum / losses_count
         
         if avg_loss == 0:
             return 0.01
@@ -286,7 +405,18 @@ class KellyPositionSizer(BasePositionSizer):
         kelly_f = (b * win_prob - loss_prob) / b
         
         # Limita entre 0 e 0.5 (50% max)
-        return max(0.01, min(0.5, kelly_f))
+        return self._clamp(kelly_f, 0.01, 0.5)
+    
+    @staticmethod
+    def _win_loss_stats_vectorized(trades) -> Tuple[float, int, float, int]:
+        """Soma e contagem de wins/losses via numpy (históricos longos)"""
+        import numpy as np  # Só carregado quando o histórico é longo
+        
+        pnls = np.fromiter((t.get('pnl', 0.0) for t in trades), dtype=np.float64, count=len(trades))
+        wins = pnls > 0
+        losses = pnls < 0
+        return (float(pnls[wins].sum()), int(np.count_nonzero(wins)),
+                float(-pnls[losses].sum()), int(np.count_nonzero(losses)))
 
 
 # core/position/sizing/__init__.py
@@ -296,7 +426,13 @@ class KellyPositionSizer(BasePositionSizer):
 Position Sizing Module - Algoritmos de dimensionamento de posições
 """
 
-from .base_sizer import BasePositionSizer, PositionSizingResult
+import sys
+from types import MappingProxyType
+
+from .base_sizer import (
+    BasePositionSizer, PositionSizingResult, NO_DETAILS,
+    METHOD_TRADITIONAL, METHOD_VOLATILITY, METHOD_KELLY, METHOD_KELLY_FALLBACK
+)
 from .traditional_sizer import TraditionalPositionSizer
 from .volatility_sizer import VolatilityPositionSizer
 from .kelly_sizer import KellyPositionSizer
@@ -305,28 +441,38 @@ from .kelly_sizer import KellyPositionSizer
 class PositionSizerFactory:
     """Factory para criar position sizers"""
     
-    _sizers = {
-        'traditional': TraditionalPositionSizer,
-        'volatility': VolatilityPositionSizer,
-        'kelly': KellyPositionSizer
-    }
+    # Registro somente leitura; chaves já normalizadas (minúsculas, internadas)
+    _sizers = MappingProxyType({
+        sys.intern('traditional'): TraditionalPositionSizer,
+        sys.intern('volatility'): VolatilityPositionSizer,
+        sys.intern('kelly'): KellyPositionSizer
+    })
     
     @classmethod
     def create(cls, sizer_type: str, config: dict) -> BasePositionSizer:
         """Cria position sizer do tipo especificado"""
-        if sizer_type not in cls._sizers:
-            raise ValueError(f"Position sizer '{sizer_type}' não suportado. Opções: {list(cls._sizers.keys())}")
-        
-        return cls._sizers[sizer_type](config)
+        sizer_class = cls._sizers.get(sizer_type)
+        if sizer_class is None and isinstance(sizer_type, str):
+            # Aceita 'Kelly', 'TRADITIONAL' etc. (só normaliza se o nome exato falhar)
+            sizer_class = cls._sizers.get(sizer_type.strip().lower())
+        if sizer_class is None:
+            raise ValueError(f"Position sizer '{sizer_type}' não suportado. Opções: {list(cls._sizers)}")
+        
+        return sizer_class(config)
     
     @classmethod
     def get_available_sizers(cls) -> list:
         """Retorna lista de sizers disponíveis"""
-        return list(cls._sizers.keys())
+        return list(cls._sizers)
 
 __all__ = [
     'BasePositionSizer',
     'PositionSizingResult', 
+    'NO_DETAILS',
+    'METHOD_TRADITIONAL',
+    'METHOD_VOLATILITY',
+    'METHOD_KELLY',
+    'METHOD_KELLY_FALLBACK',
     'TraditionalPositionSizer',
     'VolatilityPositionSizer',
     'KellyPositionSizer',
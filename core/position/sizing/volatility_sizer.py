@@ -6,15 +6,21 @@ Ajusta tamanho das posições baseado em volatilidade, correlação e condiçõe
 """
 
 import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import pandas as pd
 import requests
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple, List
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, List, Union
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+KLINES_URL = "https://open-api.bingx.com/openApi/swap/v2/quote/klines"
+
 class VolatilityRegime(Enum):
     """Regimes de volatilidade para position sizing"""
     VERY_LOW = "very_low"      # < percentil 20
@@ -23,13 +29,127 @@ class VolatilityRegime(Enum):
     HIGH = "high"              # percentil 60-80
     EXTREME = "extreme"        # > percentil 80
 
+# Regimes em ordem crescente de volatilidade; 'regime_idx' da análise indexa esta tupla
+_REGIMES = tuple(VolatilityRegime)
+
+@dataclass
+class Klines:
+    """Candles em arrays tipados (um por coluna), ordenados por timestamp"""
+    
+    __slots__ = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+    
+    timestamp: np.ndarray  # int64, ms
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.timestamp)
+    
+    def select(self, index) -> 'Klines':
+        """Aplica o mesmo índice (slice, máscara ou ordem) a todas as colunas"""
+        return Klines(*(getattr(self, name)[index] for name in self.__slots__))
+    
+    @classmethod
+    def concat(cls, first: 'Klines', second: 'Klines') -> 'Klines':
+        """Junta dois blocos de candles, first antes de second"""
+        return cls(*(np.concatenate((getattr(first, name), getattr(second, name)))
+                     for name in cls.__slots__))
+
+# Resultado vazio compartilhado (falha na busca ou resposta sem candles)
+NO_KLINES = Klines(np.empty(0, dtype=np.int64), *(np.empty(0) for _ in range(5)))
+
+class TradeBook:
+    """Histórico de PnL em buffer circular colunar (alternativa a List[Dict] para o Kelly)"""
+    
+    __slots__ = ('pnls', 'head', 'size')
+    
+    def __init__(self, capacity: int = 256):
+        self.pnls = np.zeros(capacity, dtype=np.float64)
+        self.head = 0  # Próxima posição de escrita
+        self.size = 0
+    
+    @classmethod
+    def from_trades(cls, trades: List[Dict], capacity: int = 256) -> 'TradeBook':
+        """Converte uma vez um histórico legado (lista de dicts com 'pnl')"""
+        book = cls(capacity)
+        for trade in trades[-capacity:]:
+            book.append(trade.get('pnl', 0.0))
+        return book
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def append(self, pnl: float):
+        """Registra o PnL de um trade fechado, sobrescrevendo o mais antigo se cheio"""
+        self.pnls[self.head] = pnl
+        self.head = (self.head + 1) % len(self.pnls)
+        if self.size < len(self.pnls):
+            self.size += 1
+    
+    def recent(self, n: int) -> np.ndarray:
+        """Últimos n PnLs em ordem cronológica"""
+        n = min(n, self.size)
+        start = self.head - n
+        if start >= 0:
+            return self.pnls[start:self.head]
+        return np.concatenate((self.pnls[start:], self.pnls[:self.head]))
+
 class VolatilityPositionSizer:
     """Sistema inteligente de dimensionamento baseado em volatilidade"""
     
+    # Mapeia confiança (0-1) para multiplicador: confiança alta = posições maiores,
+    # em degraus para evitar extremos (limiares exclusivos: 0.8 ainda é 1.1)
+    _CONF_THRESHOLDS = (0.5, 0.6, 0.7, 0.8)
+    _CONF_MULTIPLIERS = (0.7, 0.9, 1.0, 1.1, 1.3)
+    
+    # Percentis que separam os regimes de _REGIMES
+    _REGIME_BINS = (0.2, 0.4, 0.6, 0.8)
+    
+    # Ajuste por regime, indexado por 'regime_idx' (ordem de _REGIMES)
+    _REGIME_MULTIPLIERS = (
+        1.3,  # VERY_LOW: aumenta em baixa vol
+        1.1,  # LOW
+        1.0,  # NORMAL
+        0.8,  # HIGH: reduz em alta vol
+        0.5,  # EXTREME: reduz muito em vol extrema
+    )
+    
+    # Cache de análises de volatilidade (LRU com expiração)
+    VOL_CACHE_SIZE = 256
+    VOL_CACHE_TTL = 300  # 5 min
+    
+    # Multiplicadores memorizados por (símbolo, degrau de confiança, histórico)
+    MULT_CACHE_SIZE = 256
+    
     def __init__(self, config: Dict):
         self.config = config
-        self.volatility_cache = {}
+        self.volatility_cache: OrderedDict = OrderedDict()  # symbol -> (análise, expira_em)
+        self._vol_cache_lock = threading.Lock()  # prefetch() preenche o cache em threads
         self.correlation_cache = {}
+        # Klines já baixados por símbolo (atualizados só com candles novos)
+        self._vol_state: Dict[str, dict] = {}
+        self._mult_cache: OrderedDict = OrderedDict()
+        
+        # Sessão HTTP reutilizada (keep-alive) para os klines públicos
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        retry_strategy = Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry_strategy)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        
+        # Requisição de klines preparada uma vez (headers, proxies, verify);
+        # cada busca só copia e troca a query string
+        self._klines_request = self._session.prepare_request(requests.Request('GET', KLINES_URL))
+        self._klines_send_kwargs = self._session.merge_environment_settings(KLINES_URL, {}, None, None, None)
         
         # Configurações do sistema
         self.sizing_config = self._get_config('position_sizing', {})
@@ -68,7 +188,7 @@ class VolatilityPositionSizer:
     
     def calculate_optimal_position_size(self, symbol: str, base_size: float, 
                                       current_price: float, signal_confidence: float,
-                                      trade_history: List[Dict] = None) -> Tuple[float, Dict]:
+                                      trade_history: Union[List[Dict], 'TradeBook'] = None) -> Tuple[float, Dict]:
         """
         Calcula tamanho ótimo da posição considerando volatilidade e outros fatores
         
@@ -77,7 +197,7 @@ class VolatilityPositionSizer:
             base_size: Tamanho base calculado pelo método tradicional
             current_price: Preço atual
             signal_confidence: Confiança do sinal (0-1)
-            trade_history: Histórico de trades para Kelly Criterion
+            trade_history: Histórico de trades para Kelly Criterion (lista de dicts ou TradeBook)
             
         Returns:
             Tuple[novo_tamanho, detalhes_calculo]
@@ -86,36 +206,26 @@ class VolatilityPositionSizer:
             return base_size, {'method': 'disabled', 'multiplier': 1.0}
         
         try:
+            # Valida entradas uma vez aqui; os helpers _calculate_* assumem números
+            signal_confidence = float(signal_confidence)
+            
             # Calcula volatilidade atual
             vol_analysis = self._analyze_volatility(symbol)
             
-            # Calcula Kelly Criterion se habilitado
-            kelly_multiplier = 1.0
-            if self.use_kelly and trade_history:
-                kelly_multiplier = self._calculate_kelly_multiplier(trade_history)
-            
-            # Ajuste por volatilidade
-            vol_multiplier = self._calculate_volatility_multiplier(vol_analysis)
-            
-            # Ajuste por confiança do sinal
-            confidence_multiplier = self._calculate_confidence_multiplier(signal_confidence)
-            
-            # Verificação de correlação (se há outras posições)
-            correlation_multiplier = self._calculate_correlation_multiplier(symbol)
-            
-            # Ajuste por regime de mercado (se disponível)
-            regime_multiplier = self._calculate_regime_multiplier(symbol)
-            
-            # Multiplicador final
-            total_multiplier = (vol_multiplier * 
-                              kelly_multiplier * 
-                              confidence_multiplier * 
-                              correlation_multiplier * 
-                              regime_multiplier)
-            
-            # Aplica limites de segurança
-            total_multiplier = max(self.min_size_multiplier, 
-                                 min(self.max_size_multiplier, total_multiplier))
+            # Multiplicadores memorizados enquanto a análise de volatilidade (mesmo
+            # objeto do cache), o degrau de confiança e os PnLs da janela do Kelly não mudam
+            memo_key = (symbol, bisect_left(self._CONF_THRESHOLDS, signal_confidence),
+                        self._trade_history_key(trade_history))
+            memo = self._mult_cache.get(memo_key)
+            if memo is not None and memo[0] is vol_analysis:
+                self._mult_cache.move_to_end(memo_key)
+                total_multiplier, components = memo[1], memo[2]
+            else:
+                total_multiplier, components = self._combine_multipliers(
+                    symbol, vol_analysis, signal_confidence, trade_history)
+                self._mult_cache[memo_key] = (vol_analysis, total_multiplier, components)
+                if len(self._mult_cache) > self.MULT_CACHE_SIZE:
+                    self._mult_cache.popitem(last=False)
             
             # Calcula novo tamanho
             adjusted_size = base_size * total_multiplier
@@ -126,85 +236,211 @@ class VolatilityPositionSizer:
                 'base_size': base_size,
                 'adjusted_size': adjusted_size,
                 'total_multiplier': total_multiplier,
-                'components': {
-                    'volatility': vol_multiplier,
-                    'kelly': kelly_multiplier,
-                    'confidence': confidence_multiplier,
-                    'correlation': correlation_multiplier,
-                    'regime': regime_multiplier
-                },
+                'components': dict(components),
                 'volatility_analysis': vol_analysis
             }
             
             logger.info(f"Position sizing para {symbol}:")
             logger.info(f"  Base: {base_size:.4f} -> Adjusted: {adjusted_size:.4f}")
-            logger.info(f"  Multiplier: {total_multiplier:.3f} (Vol: {vol_multiplier:.3f}, Kelly: {kelly_multiplier:.3f})")
+            logger.info(f"  Multiplier: {total_multiplier:.3f} (Vol: {components['volatility']:.3f}, Kelly: {components['kelly']:.3f})")
             logger.info(f"  Vol regime: {vol_analysis.get('regime', 'unknown')}")
             
             return adjusted_size, calculation_details
             
         except Exception as e:
-            logger.error(f"Erro no cálculo de position sizing: {e}")
+            logger.error(f"Erro no cálculo de position sizing para {symbol}: {e}")
             return base_size, {'method': 'error', 'error': str(e)}
     
+    def _combine_multipliers(self, symbol: str, vol_analysis: Dict, signal_confidence: float,
+                             trade_history: Union[List[Dict], 'TradeBook', None]) -> Tuple[float, Dict]:
+        """Combina os multiplicadores e aplica os limites; retorna (total, componentes)"""
+        # Calcula Kelly Criterion se habilitado
+        kelly_multiplier = 1.0
+        if self.use_kelly and trade_history:
+            kelly_multiplier = self._calculate_kelly_multiplier(trade_history)
+        
+        # Ajuste por volatilidade
+        vol_multiplier = self._calculate_volatility_multiplier(vol_analysis)
+        
+        # Ajuste por confiança do sinal
+        confidence_multiplier = self._calculate_confidence_multiplier(signal_confidence)
+        
+        # Verificação de correlação (se há outras posições)
+        correlation_multiplier = self._calculate_correlation_multiplier(symbol)
+        
+        # Ajuste por regime de mercado (se disponível)
+        regime_multiplier = self._calculate_regime_multiplier(symbol)
+        
+        # Multiplicador final
+        total_multiplier = (vol_multiplier * 
+                          kelly_multiplier * 
+                          confidence_multiplier * 
+                          correlation_multiplier * 
+                          regime_multiplier)
+        
+        # Aplica limites de segurança
+        total_multiplier = max(self.min_size_multiplier, 
+                             min(self.max_size_multiplier, total_multiplier))
+        
+        components = {
+            'volatility': vol_multiplier,
+            'kelly': kelly_multiplier,
+            'confidence': confidence_multiplier,
+            'correlation': correlation_multiplier,
+            'regime': regime_multiplier
+        }
+        return total_multiplier, components
+    
+    def _trade_history_key(self, trade_history) -> Optional[Tuple]:
+        """Chave pelo conteúdo que o Kelly lê (None se o Kelly não se aplica)
+        
+        O resultado do Kelly depende só do mínimo de trades e dos PnLs da janela
+        kelly_lookback; chavear pelo conteúdo (e não pela identidade do objeto)
+        também detecta históricos reconstruídos ou editados no lugar.
+        """
+        if not (self.use_kelly and trade_history):
+            return None
+        if len(trade_history) < 10:
+            return ()
+        if isinstance(trade_history, TradeBook):
+            return tuple(trade_history.recent(self.kelly_lookback).tolist())
+        return tuple(trade.get('pnl', 0) for trade in trade_history[-self.kelly_lookback:])
+    
+    def calculate_optimal_position_size_batch(self, symbols: List[str], base_sizes: List[float],
+                                            current_prices: List[float], signal_confidences: List[float],
+                                            trade_history: Union[List[Dict], 'TradeBook'] = None) -> List[Tuple[float, Dict]]:
+        """
+        Versão em lote de calculate_optimal_position_size: os multiplicadores de
+        todos os símbolos são combinados e limitados em operações vetorizadas
+        
+        Returns:
+            Lista de Tuple[novo_tamanho, detalhes_calculo], na ordem de symbols
+        """
+        if not self.enabled:
+            return [(base_size, {'method': 'disabled', 'multiplier': 1.0}) for base_size in base_sizes]
+        
+        try:
+            analyses = self.prefetch(symbols)
+            vol_analyses = [analyses[symbol] for symbol in symbols]
+            
+            # Kelly depende só do histórico, comum a todos os símbolos
+            kelly_multiplier = 1.0
+            if self.use_kelly and trade_history:
+                kelly_multiplier = self._calculate_kelly_multiplier(trade_history)
+            
+            vol_multipliers = self._calculate_volatility_multiplier_batch(vol_analyses)
+            confidence_multipliers = self._calculate_confidence_multiplier_batch(signal_confidences)
+            correlation_multipliers = np.array([self._calculate_correlation_multiplier(s) for s in symbols])
+            regime_multipliers = np.array([self._calculate_regime_multiplier(s) for s in symbols])
+            
+            # Multiplicador final com limites de segurança
+            total_multipliers = (vol_multipliers * kelly_multiplier * confidence_multipliers *
+                                 correlation_multipliers * regime_multipliers)
+            total_multipliers = np.maximum(self.min_size_multiplier,
+                                           np.minimum(self.max_size_multiplier, total_multipliers))
+            adjusted_sizes = np.asarray(base_sizes, dtype=np.float64) * total_multipliers
+            
+            results = []
+            for i, symbol in enumerate(symbols):
+                adjusted_size = float(adjusted_sizes[i])
+                total_multiplier = float(total_multipliers[i])
+                results.append((adjusted_size, {
+                    'method': 'volatility_adjusted',
+                    'base_size': base_sizes[i],
+                    'adjusted_size': adjusted_size,
+                    'total_multiplier': total_multiplier,
+                    'components': {
+                        'volatility': float(vol_multipliers[i]),
+                        'kelly': kelly_multiplier,
+                        'confidence': float(confidence_multipliers[i]),
+                        'correlation': float(correlation_multipliers[i]),
+                        'regime': float(regime_multipliers[i])
+                    },
+                    'volatility_analysis': vol_analyses[i]
+                }))
+                logger.info(f"Position sizing para {symbol}: {base_sizes[i]:.4f} -> {adjusted_size:.4f} "
+                            f"(Multiplier: {total_multiplier:.3f}, Vol regime: {vol_analyses[i].get('regime', 'unknown')})")
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Erro no cálculo de position sizing em lote: {e}")
+            return [(base_size, {'method': 'error', 'error': str(e)}) for base_size in base_sizes]
+    
+    def prefetch(self, symbols: List[str], max_workers: int = 8) -> Dict[str, Dict]:
+        """Carrega a análise de volatilidade de vários símbolos, buscando em paralelo
+        
+        Símbolos já em cache não geram requisição; os demais são buscados
+        concorrentemente e entram no cache, de modo que o loop de sizing
+        seguinte só consulta o cache. Retorna a análise de cada símbolo.
+        """
+        analyses = {}
+        pending = []
+        for symbol in dict.fromkeys(symbols):
+            cached = self._vol_cache_get(symbol)
+            if cached is None:
+                pending.append(symbol)
+            else:
+                analyses[symbol] = cached
+        
+        if len(pending) <= 1:
+            analyses.update((symbol, self._analyze_volatility(symbol)) for symbol in pending)
+            return analyses
+        
+        # Klines vêm de requisições síncronas (requests): threads sobrepõem a latência de rede
+        workers = min(max_workers, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            analyses.update(zip(pending, pool.map(self._analyze_volatility, pending)))
+        return analyses
+    
     def _analyze_volatility(self, symbol: str) -> Dict:
         """Analisa volatilidade histórica e atual"""
         try:
             # Verifica cache
-            cache_key = f"{symbol}_vol"
-            if cache_key in self.volatility_cache:
-                cached_data, cache_time = self.volatility_cache[cache_key]
-                if (datetime.now() - cache_time).total_seconds() < 300:  # 5 min cache
-                    return cached_data
+            cached_data = self._vol_cache_get(symbol)
+            if cached_data is not None:
+                return cached_data
             
             # Busca dados históricos
-            df = self._fetch_historical_data(symbol, "1h", self.lookback_periods * 2)
+            klines = self._get_klines(symbol, "1h", self.lookback_periods * 2)
             
-            if df.empty or len(df) < self.lookback_periods:
+            if not len(klines) or len(klines) < self.lookback_periods:
                 logger.warning(f"Dados insuficientes para análise de volatilidade: {symbol}")
                 return {'regime': 'unknown', 'current_vol': 0.0, 'vol_percentile': 0.5}
             
-            # Calcula retornos horários
-            returns = df['close'].pct_change().dropna()
+            # Calcula log-retornos horários direto no array (forma canônica para
+            # volatilidade); mantém float64: em float32 preços como 65000.12 perdem os centavos
+            returns = np.diff(np.log(klines.close))
             
             # Volatilidade atual (últimas 24h)
-            current_vol = returns.iloc[-24:].std() * np.sqrt(24) * 100  # Anualizada em %
-            
-            # Volatilidade histórica (rolling windows)
-            rolling_vols = []
-            for i in range(24, len(returns), 6):  # A cada 6 horas
-                if i + 24 <= len(returns):
-                    vol = returns.iloc[i:i+24].std() * np.sqrt(24) * 100
-                    rolling_vols.append(vol)
+            current_vol = returns[-24:].std(ddof=1) * np.sqrt(24) * 100  # Anualizada em %
             
-            if not rolling_vols:
+            # Volatilidade histórica: janelas de 24h a cada 6 horas, a partir
+            # do retorno 24, calculadas numa única passada vetorizada
+            if len(returns) < 48:
                 return {'regime': 'unknown', 'current_vol': current_vol, 'vol_percentile': 0.5}
             
-            # Percentil da volatilidade atual
-            vol_percentile = np.searchsorted(sorted(rolling_vols), current_vol) / len(rolling_vols)
-            
-            # Classifica regime de volatilidade
-            if vol_percentile >= 0.8:
-                regime = VolatilityRegime.EXTREME
-            elif vol_percentile >= 0.6:
-                regime = VolatilityRegime.HIGH
-            elif vol_percentile >= 0.4:
-                regime = VolatilityRegime.NORMAL
-            elif vol_percentile >= 0.2:
-                regime = VolatilityRegime.LOW
-            else:
-                regime = VolatilityRegime.VERY_LOW
+            windows = np.lib.stride_tricks.sliding_window_view(returns, 24)[24::6]
+            rolling_vols = windows.std(axis=1, ddof=1) * np.sqrt(24) * 100
+            
+            # Percentil da volatilidade atual (fração das janelas abaixo dela)
+            vol_percentile = np.count_nonzero(rolling_vols < current_vol) / rolling_vols.size
             
+            # Classifica regime de volatilidade (limiares inclusivos: 0.8 já é EXTREME)
+            regime_idx = bisect_right(self._REGIME_BINS, vol_percentile)
+            
+            avg_vol = rolling_vols.mean()
             analysis = {
-                'regime': regime.value,
+                'regime': _REGIMES[regime_idx].value,
+                'regime_idx': regime_idx,
                 'current_vol': current_vol,
                 'vol_percentile': vol_percentile,
-                'avg_vol': np.mean(rolling_vols),
-                'vol_ratio': current_vol / np.mean(rolling_vols) if rolling_vols else 1.0
+                'avg_vol': avg_vol,
+                'vol_ratio': current_vol / avg_vol
             }
             
             # Cache resultado
-            self.volatility_cache[cache_key] = (analysis, datetime.now())
+            self._vol_cache_put(symbol, analysis)
             
             return analysis
             
@@ -212,100 +448,180 @@ class VolatilityPositionSizer:
             logger.error(f"Erro na análise de volatilidade: {e}")
             return {'regime': 'unknown', 'current_vol': 0.0, 'vol_percentile': 0.5}
     
-    def _fetch_historical_data(self, symbol: str, interval: str, limit: int) -> pd.DataFrame:
-        """Busca dados históricos da exchange"""
+    def _vol_cache_get(self, symbol: str) -> Optional[Dict]:
+        """Obtém análise ainda válida, marcando-a como recente"""
+        with self._vol_cache_lock:
+            entry = self.volatility_cache.get(symbol)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[1]:
+                del self.volatility_cache[symbol]
+                return None
+            self.volatility_cache.move_to_end(symbol)
+            return entry[0]
+    
+    def _vol_cache_put(self, symbol: str, analysis: Dict):
+        """Memoriza análise por VOL_CACHE_TTL, descartando a menos recente se necessário"""
+        with self._vol_cache_lock:
+            self.volatility_cache[symbol] = (analysis, time.monotonic() + self.VOL_CACHE_TTL)
+            self.volatility_cache.move_to_end(symbol)
+            if len(self.volatility_cache) > self.VOL_CACHE_SIZE:
+                self.volatility_cache.popitem(last=False)
+    
+    def _get_klines(self, symbol: str, interval: str, limit: int) -> 'Klines':
+        """Retorna klines do símbolo, buscando só os candles novos desde a última chamada"""
+        limit = min(limit, 1000)
+        state = self._vol_state.get(symbol)
+        
+        if state is not None and state['interval'] == interval and state['limit'] == limit:
+            # O último candle armazenado pode ainda estar em formação: busca a partir dele
+            new_klines = self._fetch_historical_data(symbol, interval, limit, start_time=state['last_ts'])
+            
+            # Resposta cheia indica lacuna maior que a janela: refaz a busca completa
+            if len(new_klines) and len(new_klines) < limit:
+                old_klines = state['klines']
+                old_klines = old_klines.select(old_klines.timestamp < new_klines.timestamp[0])
+                klines = Klines.concat(old_klines, new_klines).select(slice(-limit, None))
+                state['klines'] = klines
+                state['last_ts'] = int(klines.timestamp[-1])
+                return klines
+        
+        klines = self._fetch_historical_data(symbol, interval, limit)
+        if len(klines):
+            self._vol_state[symbol] = {
+                'interval': interval,
+                'limit': limit,
+                'last_ts': int(klines.timestamp[-1]),
+                'klines': klines
+            }
+        return klines
+    
+    def _fetch_historical_data(self, symbol: str, interval: str, limit: int,
+                               start_time: Optional[int] = None) -> 'Klines':
+        """Busca dados históricos da exchange (a partir de start_time, em ms, se informado)"""
         try:
             api_symbol = symbol.replace('/', '-')
-            url = "https://open-api.bingx.com/openApi/swap/v2/quote/klines"
             
             params = {
                 "symbol": api_symbol,
                 "interval": interval,
                 "limit": min(limit, 1000)
             }
+            if start_time is not None:
+                params["startTime"] = start_time
             
-            response = requests.get(url, params=params, timeout=15)
+            # Cópia por busca: prefetch() chama este método em várias threads
+            request = self._klines_request.copy()
+            request.prepare_url(KLINES_URL, params)
+            response = self._session.send(request, timeout=15, **self._klines_send_kwargs)
             data = response.json()
             
             if data.get("code") != 0:
-                return pd.DataFrame()
+                return NO_KLINES
             
             klines = data.get("data", [])
             if not klines:
-                return pd.DataFrame()
+                return NO_KLINES
             
-            df_data = []
-            for kline in klines:
-                df_data.append([
-                    kline['time'],
-                    float(kline['open']),
-                    float(kline['high']),
-                    float(kline['low']),
-                    float(kline['close']),
-                    float(kline['volume'])
-                ])
+            # Converte cada campo direto para um array tipado (sem lista de listas)
+            n = len(klines)
+            timestamp = np.fromiter((k['time'] for k in klines), dtype=np.int64, count=n)
+            result = Klines(timestamp, *(
+                np.fromiter((k[field] for k in klines), dtype=np.float64, count=n)
+                for field in ('open', 'high', 'low', 'close', 'volume')
+            ))
             
-            df = pd.DataFrame(df_data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df = df.sort_values('timestamp').reset_index(drop=True)
+            # A API costuma devolver os candles já ordenados (ou em ordem inversa)
+            steps = np.diff(timestamp)
+            if not (steps >= 0).all():
+                order = slice(None, None, -1) if (steps <= 0).all() else np.argsort(timestamp, kind='stable')
+                result = result.select(order)
             
-            return df
+            return result
             
         except Exception as e:
             logger.error(f"Erro ao buscar dados históricos: {e}")
-            return pd.DataFrame()
+            return NO_KLINES
     
     def _calculate_volatility_multiplier(self, vol_analysis: Dict) -> float:
         """Calcula multiplicador baseado na volatilidade"""
-        try:
-            vol_regime = vol_analysis.get('regime', 'normal')
-            current_vol = vol_analysis.get('current_vol', self.target_vol)
-            
-            # Método 1: Volatility targeting
-            if current_vol > 0:
-                vol_target_multiplier = self.target_vol / current_vol
-            else:
-                vol_target_multiplier = 1.0
-            
-            # Método 2: Regime-based adjustment
-            regime_adjustments = {
-                VolatilityRegime.VERY_LOW.value: 1.3,    # Aumenta em baixa vol
-                VolatilityRegime.LOW.value: 1.1,
-                VolatilityRegime.NORMAL.value: 1.0,
-                VolatilityRegime.HIGH.value: 0.8,        # Reduz em alta vol
-                VolatilityRegime.EXTREME.value: 0.5      # Reduz muito em vol extrema
-            }
-            
-            regime_multiplier = regime_adjustments.get(vol_regime, 1.0)
-            
-            # Combina métodos com peso configurável
-            combined_multiplier = (vol_target_multiplier * self.vol_adjustment_factor + 
-                                 regime_multiplier * (1 - self.vol_adjustment_factor))
-            
-            return max(0.3, min(2.5, combined_multiplier))
-            
-        except Exception as e:
-            logger.debug(f"Erro no cálculo de volatilidade: {e}")
-            return 1.0
+        regime_idx = vol_analysis.get('regime_idx')
+        current_vol = vol_analysis.get('current_vol', self.target_vol)
+        
+        # Método 1: Volatility targeting
+        if current_vol > 0:
+            vol_target_multiplier = self.target_vol / current_vol
+        else:
+            vol_target_multiplier = 1.0
+        
+        # Método 2: Regime-based adjustment (regime desconhecido = sem ajuste)
+        if regime_idx is None:
+            regime_multiplier = 1.0
+        else:
+            regime_multiplier = self._REGIME_MULTIPLIERS[regime_idx]
+        
+        # Combina métodos com peso configurável
+        combined_multiplier = (vol_target_multiplier * self.vol_adjustment_factor + 
+                             regime_multiplier * (1 - self.vol_adjustment_factor))
+        
+        return max(0.3, min(2.5, combined_multiplier))
+    
+    def _calculate_volatility_multiplier_batch(self, vol_analyses: List[Dict]) -> np.ndarray:
+        """Versão vetorizada de _calculate_volatility_multiplier para várias análises"""
+        current_vols = np.array([a.get('current_vol', self.target_vol) for a in vol_analyses], dtype=np.float64)
+        regime_multipliers = np.array([
+            1.0 if a.get('regime_idx') is None else self._REGIME_MULTIPLIERS[a['regime_idx']]
+            for a in vol_analyses
+        ])
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vol_target_multipliers = np.where(current_vols > 0, self.target_vol / current_vols, 1.0)
+        
+        combined = (vol_target_multipliers * self.vol_adjustment_factor +
+                    regime_multipliers * (1 - self.vol_adjustment_factor))
+        return np.maximum(0.3, np.minimum(2.5, combined))
     
-    def _calculate_kelly_multiplier(self, trade_history: List[Dict]) -> float:
+    def _calculate_kelly_multiplier(self, trade_history: Union[List[Dict], 'TradeBook']) -> float:
         """Calcula multiplicador usando Kelly Criterion"""
         try:
             if len(trade_history) < 10:  # Mínimo de trades
                 return 1.0
             
             # Usa últimos N trades
-            recent_trades = trade_history[-self.kelly_lookback:]
-            
-            # Calcula win rate e payoff ratio
-            wins = [t for t in recent_trades if t.get('pnl', 0) > 0]
-            losses = [t for t in recent_trades if t.get('pnl', 0) < 0]
-            
-            if not wins or not losses:
+            if isinstance(trade_history, TradeBook):
+                # Histórico colunar: reduções mascaradas sobre o array de PnL
+                recent_pnls = trade_history.recent(self.kelly_lookback)
+                wins = recent_pnls > 0
+                losses = recent_pnls < 0
+                wins_count = int(np.count_nonzero(wins))
+                losses_count = int(np.count_nonzero(losses))
+                # Redução mascarada direto no array, sem copiar wins/losses
+                wins_sum = float(recent_pnls.sum(where=wins))
+                losses_sum = float(-recent_pnls.sum(where=losses))
+                recent_count = recent_pnls.size
+            else:
+                recent_trades = trade_history[-self.kelly_lookback:]
+                recent_count = len(recent_trades)
+                
+                # Acumula wins/losses em uma única passada
+                wins_sum = losses_sum = 0.0
+                wins_count = losses_count = 0
+                for trade in recent_trades:
+                    pnl = trade.get('pnl', 0)
+                    if pnl > 0:
+                        wins_sum += pnl
+                        wins_count += 1
+                    elif pnl < 0:
+                        losses_sum -= pnl
+                        losses_count += 1
+            
+            if not wins_count or not losses_count:
                 return 1.0
             
-            win_rate = len(wins) / len(recent_trades)
-            avg_win = np.mean([t['pnl'] for t in wins])
-            avg_loss = abs(np.mean([t['pnl'] for t in losses]))
+            # Calcula win rate e payoff ratio
+            win_rate = wins_count / recent_count
+            avg_win = wins_sum / wins_count
+            avg_loss = losses_sum / losses_count
             
             if avg_loss == 0:
                 return 1.0
@@ -329,57 +645,36 @@ class VolatilityPositionSizer:
     
     def _calculate_confidence_multiplier(self, signal_confidence: float) -> float:
         """Ajusta tamanho baseado na confiança do sinal"""
-        try:
-            # Mapeia confiança (0-1) para multiplicador (0.5-1.5)
-            # Confiança alta = posições maiores
-            base_multiplier = 0.5 + signal_confidence
-            
-            # Curva mais suave para evitar extremos
-            if signal_confidence > 0.8:
-                multiplier = 1.3
-            elif signal_confidence > 0.7:
-                multiplier = 1.1
-            elif signal_confidence > 0.6:
-                multiplier = 1.0
-            elif signal_confidence > 0.5:
-                multiplier = 0.9
-            else:
-                multiplier = 0.7
-            
-            return multiplier
-            
-        except Exception:
-            return 1.0
+        # Curva em degraus: confiança acima de cada limiar sobe um nível
+        return self._CONF_MULTIPLIERS[bisect_left(self._CONF_THRESHOLDS, signal_confidence)]
+    
+    def _calculate_confidence_multiplier_batch(self, confidences) -> np.ndarray:
+        """Versão vetorizada de _calculate_confidence_multiplier para vários sinais"""
+        confidences = np.asarray(confidences, dtype=np.float64)
+        levels = (confidences[..., None] > np.asarray(self._CONF_THRESHOLDS)).sum(axis=-1)
+        return np.asarray(self._CONF_MULTIPLIERS)[levels]
     
     def _calculate_correlation_multiplier(self, symbol: str) -> float:
         """Ajusta tamanho considerando correlação com outras posições"""
-        try:
-            # Por enquanto, implementação simplificada
-            # Em produção, calcularia correlação real entre ativos do portfólio
-            
-            # Se BTC/ETH/SOL estão correlacionados (~0.7+), reduz tamanho
-            crypto_majors = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']
-            
-            if symbol in crypto_majors:
-                # Assumindo correlação alta entre majors
-                return 0.9  # Reduz 10% por correlação
-            
-            return 1.0  # Sem ajuste para outros pares
-            
-        except Exception:
-            return 1.0
+        # Por enquanto, implementação simplificada
+        # Em produção, calcularia correlação real entre ativos do portfólio
+        
+        # Se BTC/ETH/SOL estão correlacionados (~0.7+), reduz tamanho
+        crypto_majors = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']
+        
+        if symbol in crypto_majors:
+            # Assumindo correlação alta entre majors
+            return 0.9  # Reduz 10% por correlação
+        
+        return 1.0  # Sem ajuste para outros pares
     
     def _calculate_regime_multiplier(self, symbol: str) -> float:
         """Ajusta tamanho baseado no regime de mercado (se disponível)"""
-        try:
-            # Tenta obter regime do market analyzer se disponível
-            # Por enquanto, implementação básica
-            
-            # Pode ser expandido para integrar com regime_detection
-            return 1.0
-            
-        except Exception:
-            return 1.0
+        # Tenta obter regime do market analyzer se disponível
+        # Por enquanto, implementação básica
+        
+        # Pode ser expandido para integrar com regime_detection
+        return 1.0
     
     def calculate_portfolio_risk(self, positions: List[Dict], proposed_position: Dict) -> Dict:
         """Calcula risco total do portfólio incluindo nova posição"""
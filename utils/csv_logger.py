@@ -6,12 +6,27 @@ CSV Logger com Debug - Sistema de logging robusto para trades
 
 import csv
 import os
+import re
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+# Formato gravado em 'timestamp' (e variantes ISO) - compilado uma única vez
+_TIMESTAMP_RE = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})[ T](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?Z?$'
+)
+
+def _parse_timestamp(value: str) -> datetime:
+    """Converte timestamp do CSV em datetime sem tentar múltiplos formatos"""
+    m = _TIMESTAMP_RE.match(value)
+    if m:
+        return datetime(int(m[1]), int(m[2]), int(m[3]),
+                        int(m[4]), int(m[5]), int(m[6]),
+                        int((m[7] or '0').ljust(6, '0')))
+    return datetime.fromisoformat(value)
+
 class CSVLogger:
     """Logger CSV robusto que aceita objetos ou dicionários"""
     
@@ -306,7 +321,6 @@ class CSVLogger:
             return {}
         
         try:
-            from datetime import timedelta
             cutoff_date = datetime.now() - timedelta(days=days)
             
             trades = []
@@ -314,7 +328,7 @@ class CSVLogger:
                 reader = csv.DictReader(csvfile)
                 for row in reader:
                     try:
-                        trade_date = datetime.strptime(row.get('timestamp', ''), '%Y-%m-%d %H:%M:%S')
+                        trade_date = _parse_timestamp(row.get('timestamp', ''))
                         if trade_date >= cutoff_date:
                             trades.append(row)
                     except: